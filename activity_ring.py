@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Activity Ring Buffer
+Fixed-size, memory-mapped binary store for the last N activity log entries
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from datetime import datetime, timedelta
+
+RING_FILE = 'ACTIVITY_LOG.ring'
+STRINGS_FILE = 'ACTIVITY_LOG.strings'
+CAPACITY = 100
+
+MAGIC = b'ACTR'
+VERSION = 1
+# magic, version, record size, capacity, head (next slot), count
+HEADER = struct.Struct('<4sHHIII')
+HEADER_SIZE = 32
+# timestamp (epoch microseconds), activity type, energy level, focus score, description offset
+RECORD = struct.Struct('<qBBBxI')
+# String table entries are a length prefix followed by UTF-8 bytes
+STRING_LENGTH = struct.Struct('<H')
+
+ACTIVITY_TYPES = ('code', 'review', 'planning', 'documentation')
+UNKNOWN_TYPE = 255
+EPOCH = datetime(1970, 1, 1)
+
+def to_epoch_us(timestamp):
+    """Convert an ISO timestamp to integer microseconds since the epoch (exact round trip)"""
+    delta = datetime.fromisoformat(timestamp) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def from_epoch_us(value):
+    """Convert epoch microseconds back to the ISO timestamp format used in the log"""
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+class ActivityRing:
+    """mmap-backed ring buffer of fixed-width activity records"""
+
+    def __init__(self, path=None, strings_path=None, capacity=CAPACITY):
+        path = self.path = path or RING_FILE
+        strings_path = self.strings_path = strings_path or STRINGS_FILE
+        if not os.path.exists(path):
+            self._create(capacity)
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, record_size, self.capacity, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} activity ring")
+        self._strings = open(strings_path, 'a+b')
+        self._offsets, self._texts = self._load_strings()
+
+    def _create(self, capacity):
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, capacity, 0, 0).ljust(HEADER_SIZE, b'\0'))
+            f.write(b'\0' * (RECORD.size * capacity))
+
+    def _load_strings(self):
+        """Build the intern table from the string file"""
+        offsets, texts = {}, {}
+        self._strings.seek(0)
+        data = self._strings.read()
+        position = 0
+        while position + STRING_LENGTH.size <= len(data):
+            (length,) = STRING_LENGTH.unpack_from(data, position)
+            text = data[position + STRING_LENGTH.size:position + STRING_LENGTH.size + length].decode('utf-8', 'replace')
+            offsets[text] = position
+            texts[position] = text
+            position += STRING_LENGTH.size + length
+        return offsets, texts
+
+    def _intern(self, text):
+        offset = self._offsets.get(text)
+        if offset is None:
+            # Cut at a character boundary: a split multibyte sequence would make the file undecodable
+            stored = text.encode('utf-8')[:0xFFFF].decode('utf-8', 'ignore')
+            encoded = stored.encode('utf-8')
+            self._strings.seek(0, os.SEEK_END)
+            offset = self._strings.tell()
+            self._strings.write(STRING_LENGTH.pack(len(encoded)) + encoded)
+            self._strings.flush()
+            self._offsets[text] = offset
+            self._texts[offset] = stored
+        return offset
+
+    def _header(self):
+        _, _, _, capacity, head, count = HEADER.unpack_from(self._map, 0)
+        return head, count
+
+    def append(self, entry):
+        """Write one entry into the next slot, overwriting the oldest when full"""
+        head, count = self._header()
+        activity_type = entry.get('activity_type')
+        type_code = ACTIVITY_TYPES.index(activity_type) if activity_type in ACTIVITY_TYPES else UNKNOWN_TYPE
+        RECORD.pack_into(
+            self._map, HEADER_SIZE + head * RECORD.size,
+            to_epoch_us(entry['timestamp']),
+            type_code,
+            max(0, min(255, int(entry.get('energy_level', 0)))),
+            max(0, min(255, int(entry.get('focus_score', 0)))),
+            self._intern(entry.get('description', '')),
+        )
+        HEADER.pack_into(
+            self._map, 0, MAGIC, VERSION, RECORD.size, self.capacity,
+            (head + 1) % self.capacity, min(count + 1, self.capacity),
+        )
+        return entry
+
+    def iter_records(self, n=None):
+        """Yield raw record tuples for the last n entries (oldest first), unpacked in place from the map"""
+        head, count = self._header()
+        n = count if n is None else min(n, count)
+        for i in range(count - n, count):
+            slot = (head - count + i) % self.capacity
+            yield RECORD.unpack_from(self._map, HEADER_SIZE + slot * RECORD.size)
+
+    def tail(self, n=CAPACITY):
+        """Return the last n entries as dicts in the JSON log format"""
+        entries = []
+        for timestamp, type_code, energy, focus, offset in self.iter_records(n):
+            entries.append({
+                'timestamp': from_epoch_us(timestamp),
+                'activity_type': ACTIVITY_TYPES[type_code] if type_code < len(ACTIVITY_TYPES) else 'unknown',
+                'description': self._texts.get(offset, ''),
+                'energy_level': energy,
+                'focus_score': focus,
+            })
+        return entries
+
+    def __len__(self):
+        return self._header()[1]
+
+    def export_json(self, path):
+        """Write the ring contents in the ACTIVITY_LOG.json array format"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.tail(self.capacity), f, indent=2, ensure_ascii=False)
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        if hasattr(self, '_strings'):
+            self._strings.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'tail'
+
+    with ActivityRing() as ring:
+        if command == 'export':
+            output = sys.argv[2] if len(sys.argv) > 2 else 'ACTIVITY_LOG.json'
+            ring.export_json(output)
+            print(f"Exported {len(ring)} entries to {output}")
+        elif command == 'import':
+            import activity_store
+            source = sys.argv[2] if len(sys.argv) > 2 else activity_store.ACTIVITY_LOG_FILE
+            entries = activity_store.read_tail(ring.capacity, source)
+            for entry in entries:
+                ring.append(entry)
+            print(f"Imported {len(entries)} entries from {source}")
+        elif command == 'tail':
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+            for entry in ring.tail(count):
+                print(json.dumps(entry, ensure_ascii=False))
+        else:
+            print("Usage: activity_ring.py [tail N | export [out.json] | import [ACTIVITY_LOG.jsonl]]")
+            sys.exit(1)
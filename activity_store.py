@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Activity Log Storage
+Append-only JSON Lines store for activity log entries
+"""
+
+import os
+import sys
+import json
+
+ACTIVITY_LOG_FILE = 'ACTIVITY_LOG.jsonl'
+LEGACY_LOG_FILE = 'ACTIVITY_LOG.json'
+RETENTION = 100  # entries kept after compaction
+COMPACT_FACTOR = 2  # compact once the file holds roughly this many times RETENTION entries
+BLOCK_SIZE = 4096
+
+class ActivityStore:
+    """Append-only JSONL log with tail reads and retention compaction"""
+
+    def __init__(self, path=None, retention=RETENTION):
+        self.path = path or ACTIVITY_LOG_FILE
+        self.retention = retention
+
+    def append(self, entry):
+        """Append one entry in O(1), compacting only when the file has grown past the threshold"""
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+        # Entries are similar in size, so the latest line estimates the entry count
+        if os.path.getsize(self.path) > len(line.encode('utf-8')) * self.retention * COMPACT_FACTOR:
+            self.compact()
+        return entry
+
+    def tail(self, n=RETENTION):
+        """Return the last n entries, reading backwards from the end of the file"""
+        if n <= 0:
+            return []
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return []
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b''
+            # n entries need n newlines, plus one more to know the first line is complete
+            while position > 0 and data.count(b'\n') <= n:
+                step = min(BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = [line for line in data.split(b'\n') if line.strip()]
+        return [json.loads(line) for line in lines[-n:]]
+
+    def __iter__(self):
+        """Stream every stored entry, oldest first"""
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def compact(self):
+        """Rewrite the file keeping only the newest `retention` entries"""
+        entries = self.tail(self.retention)
+        self._rewrite(entries)
+        return len(entries)
+
+    def _rewrite(self, entries):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def migrate_from_json(self, legacy_path=None, remove=True):
+        """One-time conversion from the old JSON array file"""
+        legacy_path = legacy_path or LEGACY_LOG_FILE
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        self._rewrite(entries[-self.retention:])
+        if remove:
+            os.remove(legacy_path)
+        return len(entries[-self.retention:])
+
+    def migrate_legacy(self):
+        """Migrate the legacy file if it exists and the JSONL log does not yet"""
+        if os.path.exists(LEGACY_LOG_FILE) and not os.path.exists(self.path):
+            return self.migrate_from_json(LEGACY_LOG_FILE)
+        return 0
+
+def append_entry(entry, path=None):
+    """Append an entry to the activity log"""
+    return ActivityStore(path).append(entry)
+
+def read_tail(n=RETENTION, path=None):
+    """Read the last n activity log entries"""
+    return ActivityStore(path).tail(n)
+
+def iter_entries(path=None):
+    """Iterate over all activity log entries"""
+    return iter(ActivityStore(path))
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'tail'
+    store = ActivityStore()
+
+    if command == 'migrate':
+        legacy = sys.argv[2] if len(sys.argv) > 2 else LEGACY_LOG_FILE
+        print(f"Migrated {store.migrate_from_json(legacy)} entries to {store.path}")
+    elif command == 'compact':
+        print(f"Compacted {store.path} to {store.compact()} entries")
+    elif command == 'tail':
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        for entry in store.tail(count):
+            print(json.dumps(entry, ensure_ascii=False))
+    else:
+        print("Usage: activity_store.py [tail N | compact | migrate [legacy.json]]")
+        sys.exit(1)
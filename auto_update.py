@@ -6,11 +6,17 @@ Fetches random ASCII art, jokes, and fun content from APIs
 """
 
 import random
-import requests
+import output_writer
+import provider_chain
+import content_pool
+import profiling
+import metrics
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future
 import sys
 import io
 import os
+import time
 
 # Force UTF-8 encoding for all I/O operations
 if sys.platform == 'win32':
@@ -18,31 +24,48 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
     os.environ['PYTHONIOENCODING'] = 'utf-8'
 
-def get_programming_joke():
-    """Fetch a programming joke from API"""
-    try:
-        response = requests.get('https://official-joke-api.appspot.com/jokes/programming/random', timeout=10)
-        if response.status_code == 200:
-            joke_data = response.json()[0]
-            return f"{joke_data['setup']} {joke_data['punchline']}"
-    except:
-        pass
-    
-    # Fallback to JokeAPI
-    try:
-        response = requests.get('https://v2.jokeapi.dev/joke/Programming?type=single', timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('type') == 'single':
-                return data['joke']
-            else:
-                return f"{data.get('setup', '')} {data.get('delivery', '')}"
-    except:
-        pass
-    
-    return "Why do programmers prefer dark mode? Because light attracts bugs!"
+# Overall time budget (seconds) for all remote sources fetched concurrently
+FETCH_DEADLINE = 12
+
+OUTPUT_FILE = 'AUTO_UPDATE.md'
+# Regions that change every run and shouldn't count as a content change
+VOLATILE_PATTERNS = [r'\*\*Update Time:\*\* .*', r'\*\*Commit Number:\*\* #\d+']
+# ASCII art, changelog and fun stats are drawn once per hour (see output_writer.period_random)
+CONTENT_PERIOD = '%Y-%m-%d %H'
+
+FALLBACK_JOKE = "Why do programmers prefer dark mode? Because light attracts bugs!"
+
+def _parse_official_joke(data):
+    joke = data[0]
+    return f"{joke['setup']} {joke['punchline']}"
+
+def _parse_jokeapi(data):
+    if data.get('type') == 'single':
+        return data['joke']
+    return f"{data.get('setup', '')} {data.get('delivery', '')}"
+
+def _ascii(text):
+    # Remove problematic characters
+    return text.encode('ascii', 'ignore').decode('ascii')
 
-def get_ascii_art():
+# Primary endpoint first; later ones are hedged in when it is slow or failing
+JOKE_PROVIDERS = provider_chain.ProviderChain([
+    provider_chain.Endpoint('official-joke-api', 'https://official-joke-api.appspot.com/jokes/programming/random', _parse_official_joke),
+    provider_chain.Endpoint('jokeapi', 'https://v2.jokeapi.dev/joke/Programming?type=single', _parse_jokeapi),
+])
+QUOTE_PROVIDERS = provider_chain.ProviderChain([
+    provider_chain.Endpoint('zenquotes', 'https://zenquotes.io/api/random', lambda data: _ascii(f'"{data[0]["q"]}" - {data[0]["a"]}')),
+    provider_chain.Endpoint('quotable', 'https://api.quotable.io/random?tags=technology', lambda data: _ascii(f'"{data["content"]}" - {data["author"]}')),
+])
+FACT_PROVIDERS = provider_chain.ProviderChain([
+    provider_chain.Endpoint('uselessfacts', 'https://uselessfacts.jsph.pl/random.json?language=en', lambda data: _ascii(data.get('text', ''))),
+])
+
+def get_programming_joke(deadline=None):
+    """Fetch a programming joke from API (None if every provider failed)"""
+    return JOKE_PROVIDERS.fetch(deadline)
+
+def get_ascii_art(rng=random):
     """Get simple ASCII art patterns"""
     arts = [
         """
@@ -85,43 +108,15 @@ def get_ascii_art():
         """
     ]
     
-    return random.choice(arts)
+    return rng.choice(arts)
 
-def get_random_fact():
+def get_random_fact(deadline=None):
     """Fetch a random interesting fact"""
-    try:
-        response = requests.get('https://uselessfacts.jsph.pl/random.json?language=en', timeout=10)
-        if response.status_code == 200:
-            fact = response.json().get('text', '')
-            # Remove problematic characters
-            return fact.encode('ascii', 'ignore').decode('ascii')
-    except:
-        pass
-    
-    return None
+    return FACT_PROVIDERS.fetch(deadline)
 
-def get_quote():
+def get_quote(deadline=None):
     """Fetch an inspirational quote"""
-    try:
-        response = requests.get('https://zenquotes.io/api/random', timeout=10)
-        if response.status_code == 200:
-            data = response.json()[0]
-            quote = f'"{data["q"]}" - {data["a"]}'
-            return quote.encode('ascii', 'ignore').decode('ascii')
-    except:
-        pass
-    
-    # Fallback API
-    try:
-        response = requests.get('https://api.quotable.io/random?tags=technology', timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            quote = f'"{data["content"]}" - {data["author"]}'
-            return quote.encode('ascii', 'ignore').decode('ascii')
-    except:
-        pass
-    
-    return None
+    return QUOTE_PROVIDERS.fetch(deadline)
 
 CHANGELOG_ENTRIES = [
     "Improved the artistic quality of absolutely nothing",
@@ -145,72 +140,142 @@ CHANGELOG_ENTRIES = [
     "Painted the town with git commits"
 ]
 
-def generate_content():
-    """Generate random content for the commit"""
-    content = []
+# Remote sections and the value rendered when a source misses the deadline
+REMOTE_SOURCES = {
+    'joke': (get_programming_joke, FALLBACK_JOKE),
+    'quote': (get_quote, None),
+    'fact': (get_random_fact, None),
+}
+
+def start_remote_fetch(deadline=FETCH_DEADLINE):
+    """Draw from the content pool, launching network fetches only for what it can't supply"""
+    end = time.monotonic() + deadline
+    pool = content_pool.open_pool()
+    futures = {}
+    executor = None
+    try:
+        for name, (fetch, _) in REMOTE_SOURCES.items():
+            with profiling.span(f'pool:{name}'):
+                item = pool.draw(name) if pool else None
+            if item:
+                futures[name] = Future()
+                futures[name].set_result(item)
+                continue
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=len(REMOTE_SOURCES))
+            futures[name] = executor.submit(profiling.wrap(f'fetch:{name}', fetch), end)
+    finally:
+        if pool:
+            pool.close()
+        # Don't block on stragglers; their request timeouts are clamped to the deadline
+        if executor:
+            executor.shutdown(wait=False)
+    return futures, end
+
+def remote_result(name, future, end):
+    """Wait for one source until the deadline, falling back if it misses it or fails"""
+    with profiling.span(f'wait:{name}'):
+        try:
+            value = future.result(timeout=max(0, end - time.monotonic()))
+        except Exception:
+            value = None
+    if value:
+        return value
+    # The only place a fallback is counted: a straggler finishing after the deadline records nothing
+    metrics.record_fallback(name)
+    return REMOTE_SOURCES[name][1]
+
+def fetch_remote_content(deadline=FETCH_DEADLINE):
+    """Fetch every remote source at once and return whatever arrived in time"""
+    futures, end = start_remote_fetch(deadline)
+    return {name: remote_result(name, future, end) for name, future in futures.items()}
+
+def iter_content(deadline=FETCH_DEADLINE):
+    """Yield the document section by section; local sections come first while remote ones are in flight"""
+    futures, end = start_remote_fetch(deadline)
     
     # Add timestamp
     now = datetime.now()
-    content.append(f"# Auto-Update Log\n")
-    content.append(f"**Update Time:** {now.strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
-    content.append(f"**Commit Number:** #{random.randint(1000, 9999)}\n\n")
+    rng = output_writer.period_random('auto_update', CONTENT_PERIOD, now)
+    yield (
+        f"# Auto-Update Log\n"
+        f"**Update Time:** {now.strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
+        f"**Commit Number:** #{random.randint(1000, 9999)}\n\n"
+    )
     
     # Add random ASCII art
-    content.append("## ASCII Art of the Hour\n")
-    ascii_art = get_ascii_art()
-    content.append(f"```\n{ascii_art}\n```\n\n")
+    with profiling.span('render:ascii_art'):
+        ascii_art = get_ascii_art(rng)
+    yield f"## ASCII Art of the Hour\n```\n{ascii_art}\n```\n\n"
+    
+    # Add random changelog
+    with profiling.span('render:changelog'):
+        changelog = [f"- {rng.choice(CHANGELOG_ENTRIES)}\n" for _ in range(rng.randint(2, 4))]
+    yield "## What's New?\n" + ''.join(changelog) + "\n"
+    
+    # Add fun stats
+    yield (
+        f"## Fun Stats\n"
+        f"- Productivity: {rng.randint(0, 100)}%\n"
+        f"- Coffee consumed: {rng.randint(1, 10)} cups\n"
+        f"- Bugs created: {rng.randint(0, 5)}\n"
+        f"- Fun level: {rng.randint(80, 100)}%\n"
+        f"- Commit streak: {rng.randint(1, 365)} days\n\n"
+    )
     
     # Add random joke
-    content.append("## Programming Joke\n")
-    joke = get_programming_joke()
-    content.append(f"{joke}\n\n")
+    joke = remote_result('joke', futures['joke'], end)
+    yield f"## Programming Joke\n{joke}\n\n"
     
     # Add random quote
-    quote = get_quote()
+    quote = remote_result('quote', futures['quote'], end)
     if quote:
-        content.append("## Inspirational Quote\n")
-        content.append(f"{quote}\n\n")
+        yield f"## Inspirational Quote\n{quote}\n\n"
     
     # Add random fact
-    fact = get_random_fact()
+    fact = remote_result('fact', futures['fact'], end)
     if fact:
-        content.append("## Random Fact\n")
-        content.append(f"{fact}\n\n")
-    
-    # Add random changelog
-    content.append("## What's New?\n")
-    for _ in range(random.randint(2, 4)):
-        content.append(f"- {random.choice(CHANGELOG_ENTRIES)}\n")
-    
-    # Add fun stats
-    content.append(f"\n## Fun Stats\n")
-    content.append(f"- Productivity: {random.randint(0, 100)}%\n")
-    content.append(f"- Coffee consumed: {random.randint(1, 10)} cups\n")
-    content.append(f"- Bugs created: {random.randint(0, 5)}\n")
-    content.append(f"- Fun level: {random.randint(80, 100)}%\n")
-    content.append(f"- Commit streak: {random.randint(1, 365)} days\n")
+        yield f"## Random Fact\n{fact}\n\n"
     
     # Add footer
-    content.append(f"\n---\n")
-    content.append(f"*Generated automatically by GitHub Actions*\n")
-    
-    return ''.join(content)
+    yield "---\n*Generated automatically by GitHub Actions*\n"
+
+def generate_content(deadline=FETCH_DEADLINE):
+    """Generate random content for the commit"""
+    return ''.join(iter_content(deadline))
 
 if __name__ == "__main__":
+    # Echo the generated document to stdout unless --quiet is given
+    echo = sys.stdout if '--quiet' not in sys.argv else None
+    trace_path = profiling.trace_path_from_argv(sys.argv[1:], 'auto_update.trace.json')
+    if trace_path:
+        profiling.profiler.enable()
     try:
         print("Fetching fresh content from APIs...")
         
-        # Generate content
-        content = generate_content()
+        if echo:
+            print("\n" + "="*50)
         
-        # Write to file with UTF-8 encoding
-        with open('AUTO_UPDATE.md', 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Stream sections into a temp file as they become ready; the final
+        # rename is skipped when only the timestamp/commit number differ
+        with profiling.span('write:stream'):
+            changed = output_writer.write_stream(OUTPUT_FILE, iter_content(), VOLATILE_PATTERNS, echo=echo)
         
-        print("Content generated successfully!")
-        print("\n" + "="*50)
-        print(content)
-        print("="*50)
+        if echo:
+            print("="*50)
+        if changed:
+            print("Content generated successfully!")
+        else:
+            print(f"No meaningful changes; {OUTPUT_FILE} left untouched")
     except Exception as e:
         print(f"Error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        # Written even for failed runs; --metrics=PATH overrides .cache/auto_update.prom
+        metrics.write_textfile(metrics.textfile_from_argv(sys.argv[1:]), script='auto_update')
+    
+    if trace_path:
+        profiling.profiler.finish(trace_path)
+    
+    if '--exit-status' in sys.argv:
+        sys.exit(output_writer.exit_status(changed))
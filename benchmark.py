@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generator Benchmarks
+Times the content generators against the local mock API server
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+import platform
+import tempfile
+from datetime import datetime, timedelta
+
+import http_client
+import http_cache
+import provider_chain
+import github_client
+import github_graphql
+from mock_api_server import MockAPIServer
+
+DEFAULT_OUTPUT = 'bench_results.json'
+DEFAULT_TOLERANCE = 0.25  # fractional slowdown of warm p50 counted as a regression
+NOISE_FLOOR = 0.001  # ignore differences smaller than 1ms
+SANDBOX_COMMITS = 30  # daily commits in the sandbox repo, so the streak scan has history to read
+
+def _reset_state():
+    """Drop caches, pooled connections and rate-limit state so the next call runs cold"""
+    http_client.close()
+    http_cache._cache = None
+    provider_chain._breakers = None
+    # GitHubClient's default token was read at import; the benchmark never sends a real one
+    github_client._client = github_client.GitHubClient(token='')
+    shutil.rmtree('.cache', ignore_errors=True)
+
+def _init_git_repo(directory, commits=SANDBOX_COMMITS):
+    """Make `directory` a git repo with one commit a day up to today, for git_streak to scan"""
+    def git(*args, env=None):
+        subprocess.run(['git', *args], cwd=directory, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    git('init', '-q')
+    git('config', 'user.name', 'Benchmark')
+    git('config', 'user.email', 'benchmark@example.com')
+    git('config', 'commit.gpgsign', 'false')
+    now = datetime.now()
+    for day in range(commits, 0, -1):
+        stamp = (now - timedelta(days=day - 1)).strftime('%Y-%m-%dT%H:%M:%S')
+        env = {**os.environ, 'GIT_AUTHOR_DATE': stamp, 'GIT_COMMITTER_DATE': stamp}
+        git('commit', '-q', '--allow-empty', '-m', f'Benchmark commit {day}', env=env)
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {
+        'runs': len(ordered),
+        'min': ordered[0],
+        'mean': sum(ordered) / len(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+    }
+
+def _time(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def benchmark_targets():
+    """The functions under test, imported lazily so they pick up the sandbox cwd"""
+    import auto_update
+    import update_profile
+    import daily_activity
+    return {
+        'generate_content': auto_update.generate_content,
+        'generate_profile_readme': lambda: update_profile.generate_profile_readme('octocat'),
+        'update_activity_file': daily_activity.update_activity_file,
+        'update_daily_notes': daily_activity.update_daily_notes,
+    }
+
+def run_benchmarks(repeat=5, latency=0.0, failure_rate=0.0, seed=1234):
+    """Measure every target cold (fresh caches/connections) and warm (repeated calls)"""
+    results = {}
+    sandbox = tempfile.mkdtemp(prefix='repo-bench-')
+    original_cwd = os.getcwd()
+    saved_token = os.environ.pop('GITHUB_TOKEN', None)
+    saved_graphql_token, github_graphql.GITHUB_TOKEN = github_graphql.GITHUB_TOKEN, ''
+    try:
+        _init_git_repo(sandbox)
+        with MockAPIServer(latency=latency, failure_rate=failure_rate, seed=seed) as server:
+            http_client.set_url_overrides(server.url_overrides())
+            os.chdir(sandbox)
+            for name, func in benchmark_targets().items():
+                cold = []
+                for _ in range(repeat):
+                    _reset_state()
+                    cold.append(_time(func))
+                func()  # prime caches and connections
+                warm = [_time(func) for _ in range(repeat)]
+                results[name] = {'cold': _summary(cold), 'warm': _summary(warm)}
+                print(f"  {name:<26} cold p50 {results[name]['cold']['p50'] * 1000:8.2f} ms | "
+                      f"warm p50 {results[name]['warm']['p50'] * 1000:8.2f} ms", file=sys.stderr)
+            requests_served = len(server.requests)
+    finally:
+        os.chdir(original_cwd)
+        http_client.set_url_overrides({})
+        http_client.close()
+        shutil.rmtree(sandbox, ignore_errors=True)
+        github_graphql.GITHUB_TOKEN = saved_graphql_token
+        if saved_token is not None:
+            os.environ['GITHUB_TOKEN'] = saved_token
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'latency': latency,
+            'failure_rate': failure_rate,
+            'requests_served': requests_served,
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """List (name, phase, baseline, current) where the p50 got slower than tolerance allows"""
+    regressions = []
+    for name, phases in current['results'].items():
+        for phase, summary in phases.items():
+            before = baseline.get('results', {}).get(name, {}).get(phase)
+            if not before:
+                continue
+            if summary['p50'] > before['p50'] * (1 + tolerance) and summary['p50'] - before['p50'] > NOISE_FLOOR:
+                regressions.append((name, phase, before['p50'], summary['p50']))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the generators against a local mock API")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per target and phase (default: 5)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds of mock latency per request")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of mock requests that fail")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"Results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed fractional p50 slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    print(f"Benchmarking (repeat={args.repeat}, latency={args.latency}s, failure rate={args.failure_rate})...",
+          file=sys.stderr)
+    current = run_benchmarks(args.repeat, args.latency, args.failure_rate)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, phase, before, after in regressions:
+            print(f"[REGRESSION] {name} ({phase}): p50 {before * 1000:.2f} ms -> {after * 1000:.2f} ms",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content Pool
+SQLite-backed stock of jokes, quotes and facts, refilled off the critical path
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import http_client
+
+CONTENT_POOL_FILE = os.getenv('CONTENT_POOL_FILE', os.path.join('.cache', 'content_pool.db'))
+LOW_WATERMARK = 24  # one day of hourly runs
+KINDS = ('joke', 'quote', 'fact')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    used_at REAL,
+    UNIQUE (kind, text)
+);
+-- Dense 0..n-1 slots over unused items so a random pick is a single indexed lookup
+CREATE TABLE IF NOT EXISTS available (
+    kind TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    PRIMARY KEY (kind, slot)
+) WITHOUT ROWID;
+"""
+
+class ContentPool:
+    """Unused items per kind, drawn at random without repeats"""
+
+    def __init__(self, path=None, low_watermark=LOW_WATERMARK):
+        path = path or CONTENT_POOL_FILE
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.low_watermark = low_watermark
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def remaining(self, kind):
+        """Unused items of a kind (reads the top slot from the primary key index)"""
+        (top,) = self.db.execute('SELECT MAX(slot) FROM available WHERE kind = ?', (kind,)).fetchone()
+        return 0 if top is None else top + 1
+
+    def add(self, kind, text):
+        """Add an item unless it was ever stored before; returns True if it is new"""
+        with self.db:
+            cursor = self.db.execute(
+                'INSERT OR IGNORE INTO items (kind, text, fetched_at) VALUES (?, ?, ?)',
+                (kind, text, time.time())
+            )
+            if cursor.rowcount == 0:
+                return False
+            self.db.execute(
+                'INSERT INTO available (kind, slot, item_id) VALUES (?, ?, ?)',
+                (kind, self.remaining(kind), cursor.lastrowid)
+            )
+        return True
+
+    def draw(self, kind):
+        """Take a random unused item in O(1): pick a slot, then move the last slot into the hole"""
+        with self.db:
+            count = self.remaining(kind)
+            if count == 0:
+                return None
+            slot = random.randrange(count)
+            (item_id,) = self.db.execute(
+                'SELECT item_id FROM available WHERE kind = ? AND slot = ?', (kind, slot)
+            ).fetchone()
+            (last_id,) = self.db.execute(
+                'SELECT item_id FROM available WHERE kind = ? AND slot = ?', (kind, count - 1)
+            ).fetchone()
+            self.db.execute('DELETE FROM available WHERE kind = ? AND slot = ?', (kind, count - 1))
+            if slot != count - 1:
+                self.db.execute(
+                    'UPDATE available SET item_id = ? WHERE kind = ? AND slot = ?', (last_id, kind, slot)
+                )
+            self.db.execute('UPDATE items SET used_at = ? WHERE id = ?', (time.time(), item_id))
+            (text,) = self.db.execute('SELECT text FROM items WHERE id = ?', (item_id,)).fetchone()
+
+        if count - 1 < self.low_watermark:
+            print(f"[WARN] Content pool low: {count - 1} {kind}(s) left, run 'python content_pool.py refill'",
+                  file=sys.stderr)
+        return text
+
+    def stats(self):
+        return {kind: self.remaining(kind) for kind in KINDS}
+
+    def close(self):
+        self.db.close()
+
+def open_pool(path=None):
+    """Open the pool if it has been created by a refill, else None"""
+    path = path or CONTENT_POOL_FILE
+    if not os.path.exists(path):
+        return None
+    try:
+        return ContentPool(path)
+    except sqlite3.Error:
+        return None
+
+def _ascii(text):
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+def _bulk_jokes():
+    """Jokes from the batch endpoints of both joke APIs"""
+    jokes = []
+    response = http_client.get('https://official-joke-api.appspot.com/jokes/programming/ten')
+    if response.status_code == 200:
+        jokes += [f"{joke['setup']} {joke['punchline']}" for joke in response.json()]
+    response = http_client.get('https://v2.jokeapi.dev/joke/Programming?type=single&amount=10')
+    if response.status_code == 200:
+        jokes += [joke['joke'] for joke in response.json().get('jokes', [])]
+    return jokes
+
+def _bulk_quotes():
+    response = http_client.get('https://zenquotes.io/api/quotes')
+    if response.status_code == 200:
+        return [_ascii(f'"{quote["q"]}" - {quote["a"]}') for quote in response.json()]
+    return []
+
+def _bulk_facts(count=10):
+    facts = []
+    for _ in range(count):
+        response = http_client.get('https://uselessfacts.jsph.pl/random.json?language=en')
+        if response.status_code == 200:
+            facts.append(_ascii(response.json().get('text', '')))
+    return facts
+
+BULK_FETCHERS = {
+    'joke': _bulk_jokes,
+    'quote': _bulk_quotes,
+    'fact': _bulk_facts,
+}
+
+def refill(pool, target=LOW_WATERMARK * 3, max_rounds=5):
+    """Fetch in bulk until every kind has `target` unused items (or sources stop yielding new ones)"""
+    added = {}
+    for kind in KINDS:
+        added[kind] = 0
+        for _ in range(max_rounds):
+            if pool.remaining(kind) >= target:
+                break
+            try:
+                batch = BULK_FETCHERS[kind]()
+            except Exception as e:
+                print(f"[WARN] {kind} refill failed: {str(e)[:100]}", file=sys.stderr)
+                break
+            new = sum(pool.add(kind, text) for text in batch if text)
+            added[kind] += new
+            if new == 0:
+                break
+    return added
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the pre-fetched content pool")
+    parser.add_argument('command', choices=['refill', 'stats'])
+    parser.add_argument('--target', type=int, default=LOW_WATERMARK * 3,
+                        help="Unused items to stock per kind when refilling")
+    parser.add_argument('--if-below', type=int, default=None,
+                        help="Only refill when some kind has fewer unused items than this")
+    args = parser.parse_args()
+
+    pool = ContentPool()
+    try:
+        if args.command == 'refill':
+            if args.if_below is not None and min(pool.stats().values()) >= args.if_below:
+                print(f"Pool above {args.if_below} for every kind; nothing to do")
+            else:
+                added = refill(pool, args.target)
+                print("Added: " + ", ".join(f"{kind}={count}" for kind, count in added.items()))
+        print("Unused: " + ", ".join(f"{kind}={count}" for kind, count in pool.stats().items()))
+    finally:
+        pool.close()
@@ -7,10 +7,13 @@ Creates meaningful commits throughout the day to maintain activity
 
 import random
 from datetime import datetime
-import json
 import sys
 import io
 import os
+import activity_store
+import output_writer
+import profiling
+import metrics
 
 # Force UTF-8 encoding for all I/O operations
 if sys.platform == 'win32':
@@ -109,32 +112,41 @@ def create_activity_log():
     
     return log_entry
 
+DAILY_NOTES_FILE = 'DAILY_NOTES.md'
+# Regions that change every run and shouldn't count as a content change
+DAILY_NOTES_VOLATILE = [r'\*Last updated: .*\*']
+# The tip and productivity score are drawn once per day (see output_writer.period_random)
+DAILY_NOTES_PERIOD = '%Y-%m-%d'
+
+# Activity log backend: 'jsonl' (default) or 'ring' for the mmap ring buffer
+ACTIVITY_STORE = os.getenv('ACTIVITY_STORE', 'jsonl')
+
 def update_activity_file():
     """Update the activity tracking file"""
     log_entry = create_activity_log()
     
-    # Read existing logs
-    try:
-        with open('ACTIVITY_LOG.json', 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-    except:
-        logs = []
+    if ACTIVITY_STORE == 'ring':
+        import activity_ring
+        with profiling.span('write:activity_ring'), activity_ring.ActivityRing() as ring:
+            ring.append(log_entry)
+        return log_entry
     
-    # Add new entry
-    logs.append(log_entry)
+    store = activity_store.ActivityStore()
     
-    # Keep only last 100 entries
-    logs = logs[-100:]
+    # Convert the old ACTIVITY_LOG.json array on first run
+    with profiling.span('migrate:activity_log'):
+        store.migrate_legacy()
     
-    # Write back with UTF-8 encoding
-    with open('ACTIVITY_LOG.json', 'w', encoding='utf-8') as f:
-        json.dump(logs, f, indent=2, ensure_ascii=False)
+    # Append-only; the store compacts down to the last 100 entries on its own
+    with profiling.span('write:activity_log'):
+        store.append(log_entry)
     
     return log_entry
 
 def update_daily_notes():
     """Update daily development notes"""
     now = datetime.now()
+    rng = output_writer.period_random('daily_notes', DAILY_NOTES_PERIOD, now)
     
     tips = [
         "Remember to write clean, readable code",
@@ -154,7 +166,7 @@ def update_daily_notes():
 ## {now.strftime('%A, %B %d, %Y')}
 
 ### Tip of the Day
-{random.choice(tips)}
+{rng.choice(tips)}
 
 ### Today's Progress
 - Automated profile updates
@@ -169,17 +181,20 @@ def update_daily_notes():
 - User experience
 
 ### Productivity Score
-**{random.randint(75, 95)}%** - Great work! Keep it up!
+**{rng.randint(75, 95)}%** - Great work! Keep it up!
 
 ---
 *Last updated: {now.strftime('%H:%M:%S UTC')}*
 """
     
-    # Write with UTF-8 encoding
-    with open('DAILY_NOTES.md', 'w', encoding='utf-8') as f:
-        f.write(notes)
+    # Only rewrite when something other than the time changed
+    with profiling.span('write:daily_notes'):
+        return output_writer.write_if_changed(DAILY_NOTES_FILE, notes, DAILY_NOTES_VOLATILE)
 
 if __name__ == "__main__":
+    trace_path = profiling.trace_path_from_argv(sys.argv[1:], 'daily_activity.trace.json')
+    if trace_path:
+        profiling.profiler.enable()
     try:
         print("Creating daily activity...")
         
@@ -188,10 +203,17 @@ if __name__ == "__main__":
         print(f"Activity logged: {entry['description']}")
         
         # Update daily notes
-        update_daily_notes()
-        print("Daily notes updated!")
+        if update_daily_notes():
+            print("Daily notes updated!")
+        else:
+            print("Daily notes unchanged")
         
         print("\nAll files updated successfully!")
     except Exception as e:
         print(f"Error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        metrics.write_textfile(metrics.textfile_from_argv(sys.argv[1:]), script='daily_activity')
+    
+    if trace_path:
+        profiling.profiler.finish(trace_path)
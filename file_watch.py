@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File Change Watcher
+Blocks until watched files change, using inotify on Linux and mtime polling elsewhere
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+POLL_INTERVAL = 2.0  # seconds between stat() sweeps when inotify isn't available
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+# Directory watches, because atomic writes replace the file (and its inode) with os.replace()
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+READ_SIZE = 64 * 1024
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+class PollingWatcher:
+    """Portable fallback: compares mtimes every poll_interval seconds"""
+
+    kind = 'polling'
+
+    def __init__(self, paths, poll_interval=POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.poll_interval = poll_interval
+        self._mtimes = {path: _mtime(path) for path in self.paths}
+
+    def wait(self, timeout=None):
+        """Return the watched paths whose mtime changed; [] once timeout seconds pass without a change"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = []
+            for path in self.paths:
+                mtime = _mtime(path)
+                if mtime != self._mtimes[path]:
+                    self._mtimes[path] = mtime
+                    changed.append(path)
+            if changed:
+                return changed
+            remaining = self.poll_interval if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            time.sleep(min(self.poll_interval, remaining))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class InotifyWatcher:
+    """Linux inotify through libc; sleeps in select() until an event or the timeout"""
+
+    kind = 'inotify'
+
+    def __init__(self, paths):
+        self.paths = [os.path.abspath(path) for path in paths]
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._names = {}  # wd -> {basename: path}
+        directories = {}
+        for path in self.paths:
+            directories.setdefault(os.path.dirname(path), {})[os.path.basename(path)] = path
+        try:
+            for directory, names in directories.items():
+                wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+                self._names[wd] = names
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _read_events(self):
+        """Changed watched paths from the pending events (every path on queue overflow)"""
+        changed = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode(sys.getfilesystemencoding(), 'replace')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return list(self.paths)
+                path = self._names.get(wd, {}).get(name)
+                if path and path not in changed:
+                    changed.append(path)
+
+    def wait(self, timeout=None):
+        """Return the watched paths that changed; [] once timeout seconds pass without a change"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                return []
+            # Events for other files in the same directory don't count as a wake-up
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_watcher(paths, poll_interval=POLL_INTERVAL, use_inotify=True):
+    """inotify where the kernel supports it, else mtime polling"""
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except OSError:
+            pass
+    return PollingWatcher(paths, poll_interval)
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or ['README.md', 'AUTO_UPDATE.md', 'ACTIVITY_LOG.jsonl']
+    with open_watcher(targets) as watcher:
+        print(f"Watching {', '.join(targets)} ({watcher.kind}); Ctrl+C to stop")
+        try:
+            while True:
+                for path in watcher.wait():
+                    print(f"{time.strftime('%H:%M:%S')} {os.path.relpath(path)} changed")
+        except KeyboardInterrupt:
+            pass
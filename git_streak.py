@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contribution Streak Engine
+Computes commit streaks from local git history with an incremental cache
+"""
+
+import os
+import sys
+import json
+import subprocess
+from datetime import datetime, timezone
+
+STREAK_CACHE_FILE = os.getenv('STREAK_CACHE_FILE', os.path.join('.cache', 'streak.json'))
+
+def _git(args, repo_dir):
+    result = subprocess.run(
+        ['git'] + args,
+        capture_output=True,
+        text=True,
+        cwd=repo_dir,
+        encoding='utf-8',
+        errors='replace'
+    )
+    return result.returncode, result.stdout.strip()
+
+def get_head(repo_dir='.'):
+    """Return the HEAD commit hash, or None outside a git repository"""
+    code, output = _git(['rev-parse', 'HEAD'], repo_dir)
+    return output if code == 0 else None
+
+def iter_commit_days(repo_dir='.', revision_range='HEAD'):
+    """Stream one UTC day ordinal per commit from a single `git log --format=%ct`"""
+    process = subprocess.Popen(
+        ['git', 'log', '--format=%ct', revision_range],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        cwd=repo_dir,
+        encoding='utf-8',
+        errors='replace'
+    )
+    try:
+        for line in process.stdout:
+            line = line.strip()
+            if line:
+                yield datetime.fromtimestamp(int(line), timezone.utc).date().toordinal()
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"git log {revision_range} failed")
+
+def compute_streaks(days, today=None):
+    """Current and longest run of consecutive days from a sorted list of day ordinals"""
+    if not days:
+        return 0, 0
+
+    longest = run = 1
+    for previous, day in zip(days, days[1:]):
+        run = run + 1 if day == previous + 1 else 1
+        longest = max(longest, run)
+
+    today = today or datetime.now(timezone.utc).date().toordinal()
+    day_set = set(days)
+    # A streak is still alive if the last commit was today or yesterday
+    cursor = today if today in day_set else today - 1
+    current = 0
+    while cursor in day_set:
+        current += 1
+        cursor -= 1
+    return current, longest
+
+def _load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_cache(path, cache):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+def get_streak(repo_dir='.', cache_path=None):
+    """Return current/longest streak and total contributions, scanning only commits newer than the cached HEAD"""
+    cache_path = cache_path or STREAK_CACHE_FILE
+    head = get_head(repo_dir)
+    if head is None:
+        raise RuntimeError(f"{repo_dir} is not a git repository")
+
+    cache = _load_cache(cache_path)
+    if cache and cache.get('head') == head:
+        days, total = cache['days'], cache['total']
+    else:
+        days, total = None, 0
+        if cache and cache.get('head'):
+            # Only trust the cache if the old HEAD is still part of history (no rebase/force push)
+            code, _ = _git(['merge-base', '--is-ancestor', cache['head'], head], repo_dir)
+            if code == 0:
+                days, total = set(cache['days']), cache['total']
+                for day in iter_commit_days(repo_dir, f"{cache['head']}..{head}"):
+                    days.add(day)
+                    total += 1
+        if days is None:
+            days = set()
+            for day in iter_commit_days(repo_dir, head):
+                days.add(day)
+                total += 1
+        days = sorted(days)
+        _save_cache(cache_path, {'head': head, 'days': days, 'total': total})
+
+    current, longest = compute_streaks(days)
+    return {
+        'current_streak': current,
+        'longest_streak': longest,
+        'total_contributions': total
+    }
+
+if __name__ == "__main__":
+    repo = sys.argv[1] if len(sys.argv) > 1 else '.'
+    print(json.dumps(get_streak(repo), indent=2))
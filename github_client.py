@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub API Client
+Authenticated, cached GitHub requests that respect the rate limit and back off on 403/429
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+import http_client
+import http_cache
+
+API_URL = 'https://api.github.com'
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+
+# Requests kept back for high-priority calls; low-priority ones are deferred below this
+RATE_RESERVE = int(os.getenv('GITHUB_RATE_RESERVE', '10'))
+# Longest we sleep waiting for a reset or Retry-After before giving up on a call
+MAX_WAIT = float(os.getenv('GITHUB_MAX_WAIT', '30'))
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0  # seconds, doubled per retry, with full jitter
+
+HIGH = 'high'
+LOW = 'low'
+
+class RateLimitDeferred(Exception):
+    """Call skipped because the rate-limit budget can't cover it right now"""
+
+    def __init__(self, message, reset=None):
+        super().__init__(message)
+        self.reset = reset
+
+def _resource_for(url):
+    return 'graphql' if url.rstrip('/').endswith('/graphql') else 'core'
+
+def _is_rate_limited(response):
+    """429, or a 403 that carries rate-limit signals rather than a permissions error"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if response.headers.get('Retry-After') or response.headers.get('X-RateLimit-Remaining') == '0':
+        return True
+    return 'rate limit' in getattr(response, 'text', '').lower()
+
+class GitHubClient:
+    """Tracks X-RateLimit-Remaining/Reset per resource across every call made through it"""
+
+    def __init__(self, token=GITHUB_TOKEN, reserve=RATE_RESERVE, max_wait=MAX_WAIT,
+                 max_retries=MAX_RETRIES, api_url=API_URL, sleep=time.sleep):
+        self.token = token
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.api_url = api_url
+        self.sleep = sleep
+        self.limits = {}  # resource -> {'limit', 'remaining', 'reset'}
+        self._lock = threading.Lock()
+
+    def _url(self, path):
+        return path if path.startswith(('http://', 'https://')) else self.api_url + path
+
+    def _headers(self, headers=None):
+        merged = {'Accept': 'application/vnd.github+json'}
+        if self.token:
+            merged['Authorization'] = f'Bearer {self.token}'
+        merged.update(headers or {})
+        return merged
+
+    def _update(self, response):
+        """Record rate-limit headers, ignoring cache hits whose stored headers are stale"""
+        if getattr(response, 'from_cache', False) and not getattr(response, 'revalidated', False):
+            return
+        headers = response.headers
+        if headers.get('X-RateLimit-Remaining') is None:
+            return
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        try:
+            with self._lock:
+                self.limits[resource] = {
+                    'limit': int(headers.get('X-RateLimit-Limit', 0)),
+                    'remaining': int(headers['X-RateLimit-Remaining']),
+                    'reset': int(headers.get('X-RateLimit-Reset', 0)),
+                }
+        except ValueError:
+            pass
+
+    def budget(self, resource='core'):
+        """Last known {'limit', 'remaining', 'reset'} for a resource, or None"""
+        with self._lock:
+            state = self.limits.get(resource)
+            return dict(state) if state else None
+
+    def _check_budget(self, resource, priority):
+        """Wait for the reset when it is close, otherwise defer the call"""
+        state = self.budget(resource)
+        if not state:
+            return
+        wait = state['reset'] - time.time()
+        if wait <= 0:
+            return
+        if state['remaining'] <= 0:
+            if wait > self.max_wait:
+                raise RateLimitDeferred(f"{resource} rate limit exhausted for {int(wait)}s", state['reset'])
+            self.sleep(wait)
+        elif priority == LOW and state['remaining'] <= self.reserve:
+            raise RateLimitDeferred(
+                f"{resource} budget at {state['remaining']}, keeping {self.reserve} in reserve", state['reset']
+            )
+
+    def _retry_delay(self, response, attempt):
+        """Retry-After if given, else the reset time when exhausted, else jittered exponential backoff"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        if response.headers.get('X-RateLimit-Remaining') == '0' and response.headers.get('X-RateLimit-Reset'):
+            return max(0.0, int(response.headers['X-RateLimit-Reset']) - time.time()) + random.uniform(0, 1)
+        return random.uniform(0, BACKOFF_BASE * (2 ** attempt))
+
+    def request(self, method, path, priority=HIGH, cached=True, headers=None, max_age=None, **kwargs):
+        """Send a request; GETs go through the HTTP cache unless cached=False
+
+        max_age=0 makes a cached GET revalidate with the server every time,
+        which costs a 304 rather than a full response when nothing changed.
+        """
+        url = self._url(path)
+        resource = _resource_for(url)
+        request_headers = self._headers(headers)
+        for attempt in range(self.max_retries + 1):
+            self._check_budget(resource, priority)
+            if method == 'GET' and cached:
+                response = http_cache.get_cache().get(url, headers=request_headers, max_age=max_age, **kwargs)
+            elif method == 'GET':
+                response = http_client.get(url, headers=request_headers, **kwargs)
+            else:
+                response = http_client.post(url, headers=request_headers, **kwargs)
+            self._update(response)
+
+            if not _is_rate_limited(response) or attempt == self.max_retries:
+                return response
+            delay = self._retry_delay(response, attempt)
+            if delay > self.max_wait:
+                if priority == LOW:
+                    raise RateLimitDeferred(f"rate limited for {int(delay)}s")
+                return response
+            print(f"[WARN] GitHub returned {response.status_code}, retrying in {delay:.1f}s", file=sys.stderr)
+            self.sleep(delay)
+        return response
+
+    def get(self, path, priority=HIGH, cached=True, max_age=None, **kwargs):
+        return self.request('GET', path, priority=priority, cached=cached, max_age=max_age, **kwargs)
+
+    def post(self, path, priority=HIGH, **kwargs):
+        return self.request('POST', path, priority=priority, cached=False, **kwargs)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the shared client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GitHubClient()
+    return _client
+
+def get(path, **kwargs):
+    return get_client().get(path, **kwargs)
+
+def post(path, **kwargs):
+    return get_client().post(path, **kwargs)
+
+if __name__ == "__main__":
+    client = get_client()
+    response = client.get('/rate_limit', cached=False)
+    if response.status_code != 200:
+        print(f"GitHub API returned {response.status_code}")
+        sys.exit(1)
+    for name, state in response.json().get('resources', {}).items():
+        reset = time.strftime('%H:%M:%S', time.localtime(state['reset']))
+        print(f"{name:<24} {state['remaining']:>6}/{state['limit']:<6} resets {reset}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub GraphQL Provider
+Fetches profile stats and top repositories for many users in one round trip
+"""
+
+import os
+import sys
+import json
+import github_client
+
+GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+BATCH_SIZE = 50  # users aliased into a single query
+REPO_COUNT = 3
+
+PROFILE_FRAGMENT = """
+fragment ProfileFields on User {
+  login
+  bio
+  location
+  createdAt
+  followers { totalCount }
+  following { totalCount }
+  repositories(ownerAffiliations: OWNER, privacy: PUBLIC) { totalCount }
+  topRepositories: repositories(first: %d, ownerAffiliations: OWNER, privacy: PUBLIC, orderBy: {field: UPDATED_AT, direction: DESC}) {
+    nodes { name description stargazerCount url primaryLanguage { name } }
+  }
+}
+"""
+
+class GraphQLError(Exception):
+    pass
+
+def build_query(usernames, repo_count=REPO_COUNT):
+    """Alias one user() lookup per username; logins are passed as variables"""
+    params = ', '.join(f'$login{i}: String!' for i in range(len(usernames)))
+    fields = '\n'.join(f'  u{i}: user(login: $login{i}) {{ ...ProfileFields }}' for i in range(len(usernames)))
+    query = f'query({params}) {{\n{fields}\n}}\n' + PROFILE_FRAGMENT % repo_count
+    variables = {f'login{i}': name for i, name in enumerate(usernames)}
+    return query, variables
+
+def parse_user(node):
+    """Convert a GraphQL user node into the stats/repos shapes update_profile uses"""
+    stats = {
+        'public_repos': node['repositories']['totalCount'],
+        'followers': node['followers']['totalCount'],
+        'following': node['following']['totalCount'],
+        'created_at': node.get('createdAt', ''),
+        'bio': node.get('bio'),
+        'location': node.get('location')
+    }
+    repos = [{
+        'name': repo['name'],
+        'description': repo['description'] or 'No description',
+        'stars': repo['stargazerCount'],
+        'language': (repo.get('primaryLanguage') or {}).get('name') or 'Unknown',
+        'url': repo['url']
+    } for repo in node['topRepositories']['nodes']]
+    return {'stats': stats, 'repos': repos}
+
+def query(query_text, variables=None, url=GRAPHQL_URL, token=GITHUB_TOKEN):
+    """POST a GraphQL query and return its data (partial data is kept for missing users)"""
+    if not token:
+        raise GraphQLError("GraphQL API requires GITHUB_TOKEN")
+    response = github_client.post(
+        url,
+        json={'query': query_text, 'variables': variables or {}},
+        headers={'Authorization': f'bearer {token}'}
+    )
+    if response.status_code != 200:
+        raise GraphQLError(f"GraphQL API returned {response.status_code}")
+    payload = response.json()
+    if payload.get('data') is None:
+        raise GraphQLError(str(payload.get('errors', 'no data'))[:200])
+    return payload['data']
+
+def fetch_profiles(usernames, url=GRAPHQL_URL, token=GITHUB_TOKEN, batch_size=BATCH_SIZE, repo_count=REPO_COUNT):
+    """Fetch {username: {'stats', 'repos'}} with one request per batch; unknown users map to None"""
+    profiles = {}
+    for start in range(0, len(usernames), batch_size):
+        batch = usernames[start:start + batch_size]
+        query_text, variables = build_query(batch, repo_count)
+        data = query(query_text, variables, url=url, token=token)
+        for i, name in enumerate(batch):
+            node = data.get(f'u{i}')
+            profiles[name] = parse_user(node) if node else None
+    return profiles
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or ['Drakaniia']
+    print(json.dumps(fetch_profiles(names), indent=2))
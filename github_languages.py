@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub Language Stats
+Language bytes across a user's repositories, re-fetched only for repos pushed since the last run
+"""
+
+import os
+import sys
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import github_client
+import file_lock
+import github_repos
+
+LANGUAGES_CACHE_FILE = os.getenv('LANGUAGES_CACHE_FILE', os.path.join('.cache', 'languages.json'))
+MAX_WORKERS = int(os.getenv('LANGUAGE_FETCH_WORKERS', '8'))  # concurrent /languages requests
+TOP_LANGUAGES = 6
+BAR_LENGTH = 20
+
+def load_cache(path=None):
+    """{full_name: {'pushed_at', 'languages'}} from the last run"""
+    path = path or LANGUAGES_CACHE_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path=None):
+    path = path or LANGUAGES_CACHE_FILE
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def update_cache(entries, owners, path=None):
+    """Replace the given owners' entries, keeping whatever other processes saved meanwhile"""
+    path = path or LANGUAGES_CACHE_FILE
+    with file_lock.locked(path):
+        # Deleted repos drop out because all of an owner's old entries are replaced
+        cache = {name: entry for name, entry in load_cache(path).items() if name.partition('/')[0] not in owners}
+        cache.update(entries)
+        save_cache(cache, path)
+
+def fetch_languages(full_name, client=None):
+    """Bytes per language for one repository"""
+    client = client or github_client.get_client()
+    # Bypasses the HTTP cache: the pushed_at cache already decides when to ask
+    response = client.get(f'/repos/{full_name}/languages', priority=github_client.LOW, cached=False, timeout=10)
+    if response.status_code != 200:
+        raise github_repos.RepoFetchError(f"{full_name} languages returned {response.status_code}")
+    return response.json()
+
+def collect_languages(repos, cache_path=None, workers=None, client=None):
+    """Sum language bytes over non-fork repos; returns (totals, {'cached', 'fetched', 'failed'})
+
+    Requests start while later listing pages are still being read, with at most
+    `workers` in flight. Repos whose pushed_at matches the cache are never fetched.
+    """
+    cache = load_cache(cache_path)
+    current = {}
+    owners = set()
+    counts = {'cached': 0, 'fetched': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers or MAX_WORKERS)) as executor:
+        futures = {}
+        for repo in repos:
+            if repo['fork']:
+                continue
+            name = repo['full_name']
+            owners.add(name.partition('/')[0])
+            entry = cache.get(name)
+            if entry and entry['pushed_at'] == repo['pushed_at']:
+                current[name] = entry
+                counts['cached'] += 1
+            else:
+                futures[executor.submit(fetch_languages, name, client)] = repo
+        for future in as_completed(futures):
+            repo = futures[future]
+            name = repo['full_name']
+            try:
+                current[name] = {'pushed_at': repo['pushed_at'], 'languages': future.result()}
+                counts['fetched'] += 1
+            except Exception:
+                counts['failed'] += 1
+                # Keep last run's numbers until the fetch succeeds again
+                if name in cache:
+                    current[name] = cache[name]
+
+    update_cache(current, owners, cache_path)
+    return sum_languages(current), counts
+
+def sum_languages(cache):
+    totals = Counter()
+    for entry in cache.values():
+        totals.update(entry['languages'])
+    return totals
+
+def cached_totals(owner, cache_path=None):
+    """Totals from the last successful run, for when the listing can't be fetched"""
+    cache = load_cache(cache_path)
+    return sum_languages({name: entry for name, entry in cache.items() if name.partition('/')[0] == owner})
+
+def format_stack(totals, top=TOP_LANGUAGES):
+    """Progress bars for the top languages by share of bytes"""
+    grand_total = sum(totals.values())
+    if not grand_total:
+        return "No language data yet\n"
+    result = ""
+    for language, size in Counter(totals).most_common(top):
+        share = size / grand_total * 100
+        filled = int(share / 100 * BAR_LENGTH)
+        bar = "#" * filled + "-" * (BAR_LENGTH - filled)
+        result += f"{language:<15} {bar} {share:.1f}%\n"
+    return result
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else 'Drakaniia'
+    totals, counts = collect_languages(github_repos.iter_repos(name))
+    print(format_stack(totals), end='')
+    print(f"\n{counts['cached']} cached, {counts['fetched']} fetched, {counts['failed']} failed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub Repository Stream
+Lazily pages through a user's repositories and aggregates them in one pass
+"""
+
+import re
+import sys
+import json
+import heapq
+import itertools
+import github_client
+
+PER_PAGE = 100  # GitHub's maximum page size
+TOP_K = 3
+
+LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+class RepoFetchError(Exception):
+    pass
+
+def parse_link_header(value):
+    """Map rel -> URL from an RFC 8288 Link header"""
+    return {rel: url for url, rel in LINK_RE.findall(value or '')}
+
+def to_repo(data):
+    """Keep the fields the profile uses from a REST repository object"""
+    return {
+        'name': data['name'],
+        'full_name': data.get('full_name') or data['name'],
+        'description': data.get('description') or 'No description',
+        'stars': data.get('stargazers_count', 0),
+        'forks': data.get('forks_count', 0),
+        'language': data.get('language') or 'Unknown',
+        'url': data['html_url'],
+        'pushed_at': data.get('pushed_at') or '',
+        'fork': data.get('fork', False),
+    }
+
+def iter_repos(username, per_page=PER_PAGE, client=None):
+    """Yield repositories page by page; the next page is only requested once this one is consumed"""
+    client = client or github_client.get_client()
+    url = f'/users/{username}/repos?type=owner&sort=pushed&per_page={per_page}'
+    while url:
+        response = client.get(url, priority=github_client.LOW, timeout=10)
+        if response.status_code != 200:
+            raise RepoFetchError(f"Repository listing returned {response.status_code}")
+        for data in response.json():
+            yield to_repo(data)
+        url = parse_link_header(response.headers.get('Link')).get('next')
+
+class RepoAggregates:
+    """Running totals plus bounded top-k heaps, so memory doesn't grow with the repo count"""
+
+    def __init__(self, top_k=TOP_K):
+        self.top_k = top_k
+        self.count = 0
+        self.stars = 0
+        self.forks = 0
+        self._starred = []
+        self._pushed = []
+        self._order = itertools.count()
+
+    def _offer(self, heap, key, repo):
+        # The counter breaks ties (earlier repos win) without ever comparing dicts
+        item = (key, -next(self._order), repo)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add(self, repo):
+        self.count += 1
+        self.stars += repo['stars']
+        self.forks += repo['forks']
+        self._offer(self._starred, repo['stars'], repo)
+        # ISO-8601 timestamps sort chronologically as strings
+        self._offer(self._pushed, repo['pushed_at'], repo)
+
+    def _ranked(self, heap):
+        return [repo for _, _, repo in sorted(heap, reverse=True)]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'stars': self.stars,
+            'forks': self.forks,
+            'top_starred': self._ranked(self._starred),
+            'recently_pushed': self._ranked(self._pushed),
+            'unavailable': False,
+        }
+
+def aggregate_repos(repos, top_k=TOP_K):
+    """Single streaming pass over any iterable of repos"""
+    aggregates = RepoAggregates(top_k)
+    for repo in repos:
+        aggregates.add(repo)
+    return aggregates.summary()
+
+def repo_summary(username, top_k=TOP_K, client=None):
+    return aggregate_repos(iter_repos(username, client=client), top_k)
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else 'Drakaniia'
+    print(json.dumps(repo_summary(name), indent=2))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent HTTP Cache
+On-disk response cache with ETag / Last-Modified revalidation
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+import file_lock
+from requests.structures import CaseInsensitiveDict
+import http_client
+
+CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join('.cache', 'http'))
+DEFAULT_TTL = 300  # seconds a response is served without asking the server
+MAX_ENTRIES = 512
+MAX_BYTES = 8 * 1024 * 1024
+
+# Response headers worth keeping alongside the body
+STORED_HEADERS = (
+    'Content-Type', 'ETag', 'Last-Modified', 'Link',
+    'X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset',
+)
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry"""
+
+    def __init__(self, url, entry, from_cache=True, revalidated=False):
+        self.url = url
+        self.status_code = 200
+        self.ok = True
+        self.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        self.text = entry['body']
+        self.content = self.text.encode('utf-8')
+        self.from_cache = from_cache
+        # True when the server just answered 304, so the headers are current
+        self.revalidated = revalidated
+
+    def json(self):
+        return json.loads(self.text)
+
+class HTTPCache:
+    """URL-keyed response cache with TTL, conditional requests and LRU eviction"""
+
+    def __init__(self, directory=None, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        directory = self.directory = directory or CACHE_DIR
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+        self._index, self._stats = self._load_index()
+        # Counters as last written, so a save adds only this process's increments
+        self._saved_stats = dict(self._stats)
+        # Keys this process evicted since its last save, so the merge doesn't bring them back
+        self._removed = set()
+
+    def _load_index(self):
+        stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'evictions': 0}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            stats.update(data.get('stats', {}))
+            return data.get('entries', {}), stats
+        except (OSError, ValueError, AttributeError):
+            return {}, stats
+
+    def _write_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self._index, 'stats': self._stats}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _save_index(self):
+        """Merge with the index on disk, evict over the merged view and write it back
+
+        Batch workers share the directory; without the merge each save would drop
+        the entries other processes added, leaving their bodies on disk untracked.
+        """
+        with file_lock.locked(self.index_path):
+            disk_index, disk_stats = self._load_index()
+            for key, meta in disk_index.items():
+                if key in self._removed:
+                    continue
+                mine = self._index.get(key)
+                if mine is None or meta['last_used'] > mine['last_used']:
+                    self._index[key] = meta
+            self._stats = {name: disk_stats.get(name, 0) + value - self._saved_stats.get(name, 0)
+                           for name, value in self._stats.items()}
+            self._evict()
+            self._write_index()
+            self._saved_stats = dict(self._stats)
+            self._removed.clear()
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _read_entry(self, key):
+        try:
+            with open(self._body_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, key, url, response):
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        entry = {'url': url, 'headers': headers, 'body': response.text}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self._body_path(key)}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._body_path(key))
+        return entry, os.path.getsize(self._body_path(key))
+
+    def _evict(self):
+        """Drop least-recently-used entries until both size bounds hold"""
+        total = sum(meta['size'] for meta in self._index.values())
+        by_age = sorted(self._index, key=lambda k: self._index[k]['last_used'])
+        for key in by_age:
+            if len(self._index) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['size']
+            self._removed.add(key)
+            try:
+                os.remove(self._body_path(key))
+                # Counted only by the process that removed the body, not by every process that saw it
+                self._stats['evictions'] += 1
+            except OSError:
+                pass
+
+    def get(self, url, headers=None, max_age=None, **kwargs):
+        """GET a URL, serving fresh entries locally and revalidating stale ones
+
+        max_age overrides the TTL for this call; 0 always revalidates.
+        """
+        key = self._key(url)
+        now = time.time()
+        ttl = self.ttl if max_age is None else max_age
+        with self._lock:
+            meta = self._index.get(key)
+            entry = self._read_entry(key) if meta else None
+            if entry and now - meta['stored_at'] < ttl:
+                meta['last_used'] = now
+                self._stats['hits'] += 1
+                self._save_index()
+                return CachedResponse(url, entry)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        response = http_client.get(url, headers=request_headers, **kwargs)
+
+        with self._lock:
+            if response.status_code == 304 and entry:
+                # Not modified: keep the body, refresh freshness and rate-limit headers
+                for name in STORED_HEADERS:
+                    if name in response.headers:
+                        entry['headers'][name] = response.headers[name]
+                meta.update(stored_at=now, last_used=now)
+                self._stats['revalidations'] += 1
+                self._save_index()
+                return CachedResponse(url, entry, revalidated=True)
+
+            self._stats['misses'] += 1
+            if response.status_code == 200:
+                _, size = self._write_entry(key, url, response)
+                self._index[key] = {
+                    'url': url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'stored_at': now,
+                    'last_used': now,
+                    'size': size,
+                }
+                self._save_index()
+            return response
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock, file_lock.locked(self.index_path):
+            disk_index, _ = self._load_index()
+            for key in set(self._index) | set(disk_index):
+                try:
+                    os.remove(self._body_path(key))
+                except OSError:
+                    pass
+            self._index = {}
+            self._removed.clear()
+            self._write_index()
+            self._saved_stats = dict(self._stats)
+
+    def stats(self):
+        """Return cumulative hit/miss/revalidation counters and current cache size"""
+        with self._lock:
+            return {
+                **self._stats,
+                'entries': len(self._index),
+                'bytes': sum(meta['size'] for meta in self._index.values()),
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Return the shared cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HTTPCache()
+    return _cache
+
+def cached_get(url, **kwargs):
+    """GET through the shared cache"""
+    return get_cache().get(url, **kwargs)
+
+def stats():
+    """Return stats for the shared cache"""
+    return get_cache().stats()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'clear':
+        get_cache().clear()
+        print("HTTP cache cleared")
+    else:
+        print(json.dumps(stats(), indent=2))
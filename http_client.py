@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared HTTP Client
+One pooled keep-alive session with default headers for every update script
+"""
+
+import os
+import json
+import threading
+import requests
+from urllib.parse import urlsplit
+import metrics
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'repo-generator-bot/1.0 (+https://github.com/Drakaniia/repo_generator)'
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'application/json',
+}
+DEFAULT_TIMEOUT = 10
+# Only GitHub's rate-limit headers feed the GitHub gauges; other APIs send their own
+GITHUB_API_HOST = 'api.github.com'
+
+# Number of per-host pools to keep, and keep-alive connections per host
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))
+
+# Prefix rewrites, e.g. {"https://api.github.com": "http://127.0.0.1:8765/api.github.com"}
+# to point the scripts at a local mock server
+_url_overrides = json.loads(os.getenv('HTTP_URL_OVERRIDES', '{}'))
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, headers=None):
+    """Create a session whose connections are reused across requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def get_session():
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def configure(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, headers=None):
+    """Replace the shared session with one using different pool sizes or headers"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(pool_connections, pool_maxsize, headers)
+    return _session
+
+def close():
+    """Close all pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def set_url_overrides(overrides):
+    """Replace the URL prefix rewrites (pass {} to clear them)"""
+    global _url_overrides
+    _url_overrides = dict(overrides)
+
+def get_url_overrides():
+    """Copy of the current prefix rewrites, e.g. to restore them later"""
+    return dict(_url_overrides)
+
+def rewrite_url(url):
+    """Apply the first matching prefix rewrite"""
+    for prefix, replacement in _url_overrides.items():
+        if url.startswith(prefix):
+            return replacement + url[len(prefix):]
+    return url
+
+def _observe_rate_limit(url, response):
+    if urlsplit(url).hostname == GITHUB_API_HOST:
+        metrics.observe_rate_limit(response.headers)
+
+def get(url, **kwargs):
+    """GET through the shared session (default timeout applied)"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    response = get_session().get(rewrite_url(url), **kwargs)
+    _observe_rate_limit(url, response)
+    return response
+
+def post(url, **kwargs):
+    """POST through the shared session (default timeout applied)"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    response = get_session().post(rewrite_url(url), **kwargs)
+    _observe_rate_limit(url, response)
+    return response
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run Metrics
+Fetch outcome counters, latency histograms and GitHub rate-limit gauges in Prometheus textfile format
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+import file_lock
+
+# One textfile per script, so a run never overwrites another script's metrics. Every
+# sample carries a script="..." label, so node_exporter never sees a series twice.
+# Counters and histograms are cumulative across runs: each write adds this process's
+# new observations to the totals already in the file, so increase()/rate() work.
+METRICS_DIR = os.getenv('METRICS_DIR', '.cache')
+PREFIX = 'repo_generator'
+
+# Fetch outcomes
+SUCCESS = 'success'
+FAILURE = 'failure'
+TIMEOUT = 'timeout'
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+SAMPLE_RE = re.compile(r'^(\w+)(?:\{(.*)\})? (\S+)$')
+LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+_lock = threading.Lock()
+REGISTRY = []
+_flushed = {}  # snapshot() as of the last write, so a second write only adds what's new
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _unescape(value):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), value)
+
+def _parse_number(text):
+    if text == '+Inf':
+        return float('inf')
+    return float(text) if any(c in text for c in '.eE') else int(text)
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    kind = 'untyped'
+    cumulative = False  # carried over from the previous textfile on write
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = f'{PREFIX}_{name}'
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.values = {}
+        REGISTRY.append(self)
+
+    def render(self, base=()):
+        """Exposition lines; `base` is (name, value) pairs put before every sample's own labels"""
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        with _lock:
+            items = sorted(self.values.items())
+        names = tuple(name for name, _ in base) + self.label_names
+        prefix = tuple(value for _, value in base)
+        for labels, value in items:
+            lines.extend(self._samples(names, prefix + labels, value))
+        return lines
+
+    def _samples(self, names, labels, value):
+        return [f'{self.name}{_labels(names, labels)} {_number(value)}']
+
+    def clear(self):
+        with _lock:
+            self.values.clear()
+
+    def merge(self, values):
+        """Fold in samples from another process (gauges: theirs win)"""
+        with _lock:
+            self.values.update(values)
+
+class Counter(Metric):
+    kind = 'counter'
+    cumulative = True
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def merge(self, values):
+        with _lock:
+            for labels, amount in values.items():
+                self.values[labels] = self.values.get(labels, 0) + amount
+
+    def carry_over(self, previous, flushed):
+        """Totals from the last textfile plus what was recorded since this process last wrote (holds _lock)"""
+        for labels in set(previous) | set(self.values):
+            self.values[labels] = previous.get(labels, 0) + self.values.get(labels, 0) - flushed.get(labels, 0)
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, *labels):
+        with _lock:
+            self.values[labels] = value
+
+class Histogram(Metric):
+    kind = 'histogram'
+    cumulative = True
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, *labels):
+        with _lock:
+            counts, total = self.values.get(labels, ([0] * len(self.buckets), 0.0))
+            index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+            counts[index] += 1
+            self.values[labels] = (counts, total + value)
+
+    def merge(self, values):
+        with _lock:
+            for labels, (counts, total) in values.items():
+                mine, my_total = self.values.get(labels, ([0] * len(self.buckets), 0.0))
+                self.values[labels] = ([a + b for a, b in zip(mine, counts)], my_total + total)
+
+    def carry_over(self, previous, flushed):
+        empty = ([0] * len(self.buckets), 0.0)
+        for labels in set(previous) | set(self.values):
+            (old, old_total), (mine, my_total), (seen, seen_total) = (
+                previous.get(labels, empty), self.values.get(labels, empty), flushed.get(labels, empty))
+            self.values[labels] = ([a + b - c for a, b, c in zip(old, mine, seen)], old_total + my_total - seen_total)
+
+    def _samples(self, names, labels, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            le = _labels(names, labels, [('le', _number(bound))])
+            lines.append(f'{self.name}_bucket{le} {cumulative}')
+        lines.append(f'{self.name}_sum{_labels(names, labels)} {total!r}')
+        lines.append(f'{self.name}_count{_labels(names, labels)} {cumulative}')
+        return lines
+
+FETCHES = Counter('fetch_total', 'Fetch attempts by source and outcome.', ('source', 'outcome'))
+FETCH_LATENCY = Histogram('fetch_duration_seconds', 'Fetch latency by source.', ('source',))
+FALLBACKS = Counter('fallback_total', 'Sections rendered from built-in fallback content.', ('section',))
+RATE_LIMIT_REMAINING = Gauge('github_ratelimit_remaining', 'Last X-RateLimit-Remaining seen from GitHub.', ('resource',))
+RATE_LIMIT_RESET = Gauge('github_ratelimit_reset_timestamp_seconds', 'Last X-RateLimit-Reset seen from GitHub.', ('resource',))
+LAST_RUN = Gauge('last_run_timestamp_seconds', 'When the script last wrote its metrics.')
+
+def is_timeout(exc):
+    # Imported here so scripts that never make HTTP calls don't need requests installed
+    import requests
+    return isinstance(exc, (requests.Timeout, TimeoutError))
+
+def record_fetch(source, outcome, duration=None):
+    """Count one fetch outcome and, if timed, its latency"""
+    FETCHES.inc(source, outcome)
+    if duration is not None:
+        FETCH_LATENCY.observe(duration, source)
+
+def record_error(source, exc, duration=None):
+    """Count an exception as a timeout or a failure"""
+    record_fetch(source, TIMEOUT if is_timeout(exc) else FAILURE, duration)
+
+def record_fallback(section):
+    FALLBACKS.inc(section)
+
+def observe_rate_limit(headers):
+    """Keep the latest rate-limit headroom from a GitHub response"""
+    remaining = headers.get('X-RateLimit-Remaining')
+    if remaining is None:
+        return
+    resource = headers.get('X-RateLimit-Resource', 'core')
+    try:
+        RATE_LIMIT_REMAINING.set(int(remaining), resource)
+        if headers.get('X-RateLimit-Reset'):
+            RATE_LIMIT_RESET.set(int(headers['X-RateLimit-Reset']), resource)
+    except ValueError:
+        pass
+
+def render(script=None):
+    """All registered metrics in Prometheus text exposition format, labelled with the script if given"""
+    base = (('script', script),) if script else ()
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render(base))
+    return '\n'.join(lines) + '\n'
+
+def read_textfile(path):
+    """{metric name: {labels: value}} for the counters and histograms in a textfile we wrote"""
+    by_name = {metric.name: metric for metric in REGISTRY if metric.cumulative}
+    samples = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return samples
+    buckets = {}
+    for line in lines:
+        match = SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, label_text, value = match.groups()
+        labels = {key: _unescape(text) for key, text in LABEL_RE.findall(label_text or '')}
+        base, _, suffix = name.rpartition('_')
+        metric = by_name.get(name) or by_name.get(base)
+        if metric is None:
+            continue
+        key = tuple(labels.get(label, '') for label in metric.label_names)
+        if isinstance(metric, Histogram):
+            if metric.name != base:
+                continue
+            if suffix == 'bucket':
+                buckets.setdefault((metric.name, key), []).append((_parse_number(labels['le']), value))
+            elif suffix == 'sum':
+                samples.setdefault(metric.name, {})[key] = ([0] * len(metric.buckets), _parse_number(value))
+        else:
+            samples.setdefault(metric.name, {})[key] = _parse_number(value)
+    for (name, key), bounds in buckets.items():
+        counts, total = samples.setdefault(name, {}).get(key, (None, 0.0))
+        # Buckets are written cumulatively; turn them back into per-bucket counts
+        cumulative = [count for _, count in sorted((bound, int(count)) for bound, count in bounds)]
+        if len(cumulative) == len(by_name[name].buckets):
+            samples[name][key] = ([b - a for a, b in zip([0] + cumulative, cumulative)], total)
+        else:
+            samples[name].pop(key, None)
+    return samples
+
+def _carry_over(path):
+    """Fold the totals already in `path` into the counters and histograms (call under the file lock)"""
+    global _flushed
+    previous = read_textfile(path)
+    with _lock:
+        for metric in REGISTRY:
+            if metric.cumulative:
+                metric.carry_over(previous.get(metric.name, {}), _flushed.get(metric.name, {}))
+    _flushed = snapshot()
+
+def textfile_path(script=None):
+    """Default textfile for a script: METRICS_DIR/<script>.prom"""
+    return os.path.join(METRICS_DIR, f"{script or 'metrics'}.prom")
+
+def write_textfile(path=None, script=None):
+    """Atomically write the metrics file for node_exporter's textfile collector"""
+    path = path or textfile_path(script)
+    LAST_RUN.set(int(time.time()))
+    try:
+        with file_lock.locked(path):
+            _carry_over(path)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(render(script))
+            os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[WARN] Could not write metrics to {path}: {e}", file=sys.stderr)
+        return False
+    return True
+
+def textfile_from_argv(argv):
+    """Return the path from --metrics=PATH, if given"""
+    for arg in argv:
+        if arg.startswith('--metrics='):
+            return arg.split('=', 1)[1] or None
+    return None
+
+def reset():
+    global _flushed
+    for metric in REGISTRY:
+        metric.clear()
+    _flushed = {}
+
+def snapshot():
+    """Picklable copy of every metric's samples, for handing back from a worker process"""
+    with _lock:
+        return {metric.name: {labels: (list(value[0]), value[1]) if isinstance(value, tuple) else value
+                              for labels, value in metric.values.items()}
+                for metric in REGISTRY}
+
+def merge(samples):
+    """Add a worker's snapshot() into this process's metrics"""
+    by_name = {metric.name: metric for metric in REGISTRY}
+    for name, values in samples.items():
+        if name in by_name:
+            by_name[name].merge(values)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        paths = [sys.argv[1]]
+    else:
+        paths = sorted(os.path.join(METRICS_DIR, name) for name in os.listdir(METRICS_DIR)
+                       if name.endswith('.prom')) if os.path.isdir(METRICS_DIR) else []
+    if not paths:
+        print(f"No metrics written yet in {METRICS_DIR}")
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                print(f"# {path}")
+                print(f.read(), end='')
+        except OSError:
+            print(f"No metrics written yet at {path}")
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mock API Server
+Local stand-in for every external endpoint the scripts call, with injectable latency and failures
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Real hosts the scripts talk to; each is served under /<host>/ on the mock server
+HOSTS = (
+    'api.github.com',
+    'official-joke-api.appspot.com',
+    'v2.jokeapi.dev',
+    'zenquotes.io',
+    'api.quotable.io',
+    'uselessfacts.jsph.pl',
+)
+DEFAULT_HOST = 'api.github.com'
+
+FIXTURE_USERS = {
+    'octocat': {
+        'login': 'octocat',
+        'bio': 'Mascot of the mock server',
+        'location': 'San Francisco',
+        'created_at': '2011-01-25T18:44:36Z',
+        'followers': 42,
+        'following': 7,
+        'repos': [
+            {'name': 'hello-world', 'description': 'My first repository', 'stars': 12, 'forks': 4,
+             'language': 'Python', 'pushed_at': '2024-05-01T10:00:00Z'},
+            {'name': 'spoon-knife', 'description': None, 'stars': 3, 'forks': 9,
+             'language': None, 'pushed_at': '2023-11-20T08:30:00Z'},
+            {'name': 'linguist', 'description': 'Language detection', 'stars': 99, 'forks': 21,
+             'language': 'Ruby', 'pushed_at': '2024-06-12T16:45:00Z'},
+            {'name': 'dotfiles', 'description': 'Config', 'stars': 0, 'forks': 0,
+             'language': 'Shell', 'pushed_at': '2022-01-03T12:00:00Z'},
+        ],
+    },
+    'hubot': {
+        'login': 'hubot',
+        'bio': None,
+        'location': None,
+        'created_at': '2012-03-01T00:00:00Z',
+        'followers': 5,
+        'following': 0,
+        'repos': [],
+    },
+}
+
+JOKES = [
+    ("Why do Java developers wear glasses?", "Because they don't C#."),
+    ("How many programmers does it take to change a light bulb?", "None, that's a hardware problem."),
+    ("Why did the developer go broke?", "Because he used up all his cache."),
+]
+QUOTES = [
+    ("Simplicity is prerequisite for reliability.", "Edsger Dijkstra"),
+    ("Make it work, make it right, make it fast.", "Kent Beck"),
+    ("Premature optimization is the root of all evil.", "Donald Knuth"),
+]
+FACTS = [
+    "Honey never spoils.",
+    "Octopuses have three hearts.",
+    "Bananas are berries, but strawberries are not.",
+]
+
+USER_ALIAS_RE = re.compile(r'(\w+):\s*user\(login:\s*\$(\w+)\)')
+FIRST_RE = re.compile(r'topRepositories:\s*repositories\(first:\s*(\d+)')
+
+def url_overrides(base_url):
+    """http_client.set_url_overrides() mapping that sends every known host to this server"""
+    return {f'https://{host}': f'{base_url}/{host}' for host in HOSTS}
+
+def _repo_url(login, repo):
+    return f"https://github.com/{login}/{repo['name']}"
+
+def rest_user(user):
+    return {
+        'login': user['login'],
+        'bio': user['bio'],
+        'location': user['location'],
+        'created_at': user['created_at'],
+        'followers': user['followers'],
+        'following': user['following'],
+        'public_repos': len(user['repos']),
+    }
+
+def rest_repos(user, page=1, per_page=30):
+    start = (page - 1) * per_page
+    return [{
+        'name': repo['name'],
+        'full_name': f"{user['login']}/{repo['name']}",
+        'description': repo['description'],
+        'stargazers_count': repo['stars'],
+        'forks_count': repo.get('forks', 0),
+        'language': repo['language'],
+        'html_url': _repo_url(user['login'], repo),
+        'pushed_at': repo.get('pushed_at'),
+        'fork': False,
+    } for repo in user['repos'][start:start + per_page]]
+
+def repo_languages(repo):
+    """Bytes per language; fixtures may give 'languages', otherwise derived from 'language'"""
+    if 'languages' in repo:
+        return repo['languages']
+    if not repo['language']:
+        return {}
+    return {repo['language']: 1000 * (repo['stars'] + 1), 'Shell': 120}
+
+def page_links(base_url, page, per_page, total):
+    """GitHub-style Link header for a paginated listing, or None for a single page"""
+    last = max(1, -(-total // per_page))
+    links = []
+    if page < last:
+        links.append(f'<{base_url}?per_page={per_page}&page={page + 1}>; rel="next"')
+        links.append(f'<{base_url}?per_page={per_page}&page={last}>; rel="last"')
+    if page > 1:
+        links.append(f'<{base_url}?per_page={per_page}&page=1>; rel="first"')
+        links.append(f'<{base_url}?per_page={per_page}&page={page - 1}>; rel="prev"')
+    return ', '.join(links) or None
+
+def generated_user(login, repo_count):
+    """Fixture user with many repositories, for pagination tests"""
+    return {
+        'login': login,
+        'bio': None,
+        'location': None,
+        'created_at': '2015-01-01T00:00:00Z',
+        'followers': 0,
+        'following': 0,
+        'repos': [{
+            'name': f'repo-{i}',
+            'description': None,
+            'stars': (i * 37) % 1000,
+            'forks': i % 7,
+            'language': ('Python', 'Go', 'Rust', None)[i % 4],
+            'pushed_at': f'20{10 + i % 15:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z',
+        } for i in range(repo_count)],
+    }
+
+WORKFLOWS = {
+    'hourly-update.yml': 'Hourly Auto Update',
+    'update-profile.yml': 'Update Profile README',
+    'daily-activity.yml': 'Daily Activity',
+}
+
+def workflow_run(run_id, workflow='hourly-update.yml', created_at='2024-06-01T12:00:00Z', status='completed',
+                 conclusion='success', queued=5, duration=60, attempt=1):
+    """Actions run object; queued/duration are seconds from creation to start and start to last update"""
+    created = datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%SZ')
+    started = created + timedelta(seconds=queued)
+    updated = started + timedelta(seconds=duration)
+    return {
+        'id': run_id,
+        'name': WORKFLOWS.get(workflow, workflow),
+        'path': f'.github/workflows/{workflow}',
+        'event': 'schedule',
+        'status': status,
+        'conclusion': conclusion if status == 'completed' else None,
+        'run_attempt': attempt,
+        'created_at': created_at,
+        'run_started_at': started.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'updated_at': updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'html_url': f'https://github.com/octocat/octocat/actions/runs/{run_id}',
+    }
+
+WORKFLOW_STEPS = ('Set up job', 'Checkout repository', 'Set up Python', 'Install dependencies',
+                  'Generate update content', 'Commit and push changes', 'Complete job')
+
+def workflow_jobs(run, failed_step=None):
+    """Jobs payload for a run; steps after failed_step are skipped"""
+    steps, state = [], 'success'
+    for number, name in enumerate(WORKFLOW_STEPS, 1):
+        if name == failed_step:
+            state = 'failure'
+        steps.append({'name': name, 'number': number, 'status': 'completed', 'conclusion': state})
+        if state == 'failure':
+            state = 'skipped'
+    return {'total_count': 1, 'jobs': [{
+        'id': run['id'] * 10,
+        'run_id': run['id'],
+        'name': 'update',
+        'status': run['status'],
+        'conclusion': run['conclusion'],
+        'steps': steps,
+    }]}
+
+def graphql_user(user, first):
+    return {
+        'login': user['login'],
+        'bio': user['bio'],
+        'location': user['location'],
+        'createdAt': user['created_at'],
+        'followers': {'totalCount': user['followers']},
+        'following': {'totalCount': user['following']},
+        'repositories': {'totalCount': len(user['repos'])},
+        'topRepositories': {'nodes': [{
+            'name': repo['name'],
+            'description': repo['description'],
+            'stargazerCount': repo['stars'],
+            'url': _repo_url(user['login'], repo),
+            'primaryLanguage': {'name': repo['language']} if repo['language'] else None,
+        } for repo in user['repos'][:first]]},
+    }
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    server_version = 'MockAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; avoid delayed-ACK stalls on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    rate_limit = None
+
+    def _send_rate_limit(self):
+        if self.rate_limit:
+            remaining, reset = self.rate_limit
+            self.send_header('X-RateLimit-Limit', str(self.server.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(remaining))
+            self.send_header('X-RateLimit-Reset', str(reset))
+            self.send_header('X-RateLimit-Resource', 'core')
+
+    def _send_json(self, status, payload, etag=False, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        tag = '"%s"' % hashlib.sha1(body).hexdigest() if etag else None
+        if tag and self.headers.get('If-None-Match') == tag:
+            self.send_response(304)
+            self.send_header('ETag', tag)
+            self._send_rate_limit()
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if tag:
+            self.send_header('ETag', tag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self._send_rate_limit()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        """Split /<host>/<path> (host defaults to api.github.com) and apply latency/failures"""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        host = parts.pop(0) if parts and parts[0] in HOSTS else DEFAULT_HOST
+        with self.server.lock:
+            self.server.requests.append((self.command, host, self.path))
+            failed = self.server.rng.random() < self.server.failure_rate.get(host, self.server.default_failure_rate)
+            if host == DEFAULT_HOST:
+                self.server.rate_used += 1
+                self.rate_limit = (max(0, self.server.rate_limit - self.server.rate_used), self.server.rate_reset)
+        latency = self.server.latency.get(host, self.server.default_latency)
+        if latency:
+            time.sleep(latency)
+        if failed:
+            self._send_json(503, {'message': 'Injected failure'})
+            return None
+        return host, parts, parse_qs(url.query)
+
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return
+        host, parts, query = route
+        rng = self.server.rng
+
+        if host == 'api.github.com':
+            users = self.server.users
+            if len(parts) >= 2 and parts[0] == 'users' and parts[1] in users:
+                user = users[parts[1]]
+                if len(parts) == 2:
+                    return self._send_json(200, rest_user(user), etag=True)
+                if len(parts) == 3 and parts[2] == 'repos':
+                    page = int(query.get('page', ['1'])[0])
+                    per_page = min(100, int(query.get('per_page', ['30'])[0]))
+                    base_url = f"http://{self.headers.get('Host')}/{host}/users/{user['login']}/repos"
+                    link = page_links(base_url, page, per_page, len(user['repos']))
+                    return self._send_json(200, rest_repos(user, page, per_page), etag=True,
+                                           headers={'Link': link} if link else None)
+            if len(parts) == 5 and parts[0] == 'repos' and parts[3:] == ['actions', 'runs']:
+                page = int(query.get('page', ['1'])[0])
+                per_page = min(100, int(query.get('per_page', ['30'])[0]))
+                with self.server.lock:
+                    runs = list(self.server.workflow_runs)
+                base_url = f"http://{self.headers.get('Host')}/{host}/{'/'.join(parts)}"
+                link = page_links(base_url, page, per_page, len(runs))
+                start = (page - 1) * per_page
+                payload = {'total_count': len(runs), 'workflow_runs': runs[start:start + per_page]}
+                return self._send_json(200, payload, etag=True, headers={'Link': link} if link else None)
+            if len(parts) == 7 and parts[0] == 'repos' and parts[3:5] == ['actions', 'runs'] and parts[6] == 'jobs':
+                with self.server.lock:
+                    run = next((run for run in self.server.workflow_runs if str(run['id']) == parts[5]), None)
+                    failed = self.server.failed_steps.get(run['id']) if run else None
+                if run is not None:
+                    return self._send_json(200, workflow_jobs(run, failed), etag=True)
+            if len(parts) == 4 and parts[0] == 'repos' and parts[3] == 'languages' and parts[1] in users:
+                repo = next((repo for repo in users[parts[1]]['repos'] if repo['name'] == parts[2]), None)
+                if repo is not None:
+                    return self._send_json(200, repo_languages(repo), etag=True)
+        elif host == 'official-joke-api.appspot.com' and parts[:2] == ['jokes', 'programming']:
+            count = 10 if parts[2:] == ['ten'] else 1
+            return self._send_json(200, [
+                {'type': 'programming', 'setup': setup, 'punchline': punchline}
+                for setup, punchline in rng.sample(JOKES * 4, count)
+            ])
+        elif host == 'v2.jokeapi.dev' and parts[:2] == ['joke', 'Programming']:
+            amount = int(query.get('amount', ['1'])[0])
+            jokes = [{'type': 'single', 'joke': f'{setup} {punchline}'} for setup, punchline in rng.sample(JOKES * 4, amount)]
+            return self._send_json(200, {'amount': amount, 'jokes': jokes} if amount > 1 else jokes[0])
+        elif host == 'zenquotes.io' and parts[:1] == ['api']:
+            count = 50 if parts[1:] == ['quotes'] else 1
+            return self._send_json(200, [{'q': q, 'a': a} for q, a in rng.choices(QUOTES, k=count)])
+        elif host == 'api.quotable.io' and parts == ['random']:
+            content, author = rng.choice(QUOTES)
+            return self._send_json(200, {'content': content, 'author': author})
+        elif host == 'uselessfacts.jsph.pl' and parts == ['random.json']:
+            return self._send_json(200, {'text': rng.choice(FACTS)})
+
+        self._send_json(404, {'message': 'Not Found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b''
+        route = self._route()
+        if route is None:
+            return
+        host, parts, _ = route
+        if host != 'api.github.com' or parts != ['graphql']:
+            return self._send_json(404, {'message': 'Not Found'})
+        if not self.headers.get('Authorization'):
+            return self._send_json(401, {'message': 'Requires authentication'})
+
+        payload = json.loads(body or b'{}')
+        query_text = payload.get('query', '')
+        variables = payload.get('variables') or {}
+        first_match = FIRST_RE.search(query_text)
+        first = int(first_match.group(1)) if first_match else 100
+
+        data, errors = {}, []
+        for alias, variable in USER_ALIAS_RE.findall(query_text):
+            login = variables.get(variable)
+            user = self.server.users.get(login)
+            data[alias] = graphql_user(user, first) if user else None
+            if not user:
+                errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                               'message': f"Could not resolve to a User with the login of '{login}'."})
+        response = {'data': data}
+        if errors:
+            response['errors'] = errors
+        self._send_json(200, response)
+
+class MockAPIServer:
+    """Threaded local server; use as a context manager and read .url
+
+    latency / failure_rate apply to every host unless overridden per host
+    via host_latency / host_failure_rate (e.g. {'zenquotes.io': 2.0}).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, users=None, latency=0.0, failure_rate=0.0,
+                 host_latency=None, host_failure_rate=None, seed=None):
+        self.httpd = ThreadingHTTPServer((host, port), MockAPIHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.users = users if users is not None else FIXTURE_USERS
+        self.httpd.requests = []
+        self.httpd.lock = threading.Lock()
+        self.httpd.rng = random.Random(seed)
+        self.httpd.default_latency = latency
+        self.httpd.default_failure_rate = failure_rate
+        self.httpd.latency = dict(host_latency or {})
+        self.httpd.failure_rate = dict(host_failure_rate or {})
+        # GitHub-style rate-limit headers on api.github.com responses
+        self.httpd.rate_limit = 5000
+        self.httpd.rate_used = 0
+        self.httpd.rate_reset = int(time.time()) + 3600
+        # Actions runs for any /repos/{owner}/{repo}/actions/runs, newest first
+        self.httpd.workflow_runs = []
+        self.httpd.failed_steps = {}  # run id -> name of the step that failed
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        with self.httpd.lock:
+            return list(self.httpd.requests)
+
+    def url_overrides(self):
+        return url_overrides(self.url)
+
+    def start(self):
+        # A short poll interval lets stop() return promptly instead of after up to 0.5s
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the mock API server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = MockAPIServer(port=args.port, latency=args.latency, failure_rate=args.failure_rate)
+    print(f"Mock API server listening on {server.url} (Ctrl+C to stop)")
+    print(f"Point the scripts at it with HTTP_URL_OVERRIDES='{json.dumps(server.url_overrides())}'")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
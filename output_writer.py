@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Output Writer
+Skips rewriting generated files when only volatile regions changed
+"""
+
+import os
+import re
+import random
+import hashlib
+from datetime import datetime
+
+# Exit status for --exit-status runs where nothing meaningful changed
+EXIT_CHANGED = 0
+EXIT_UNCHANGED = 3
+
+def period_random(name, period, now=None):
+    """Random generator seeded from `name` and the current period (a strftime format, e.g. '%Y-%m-%d')
+
+    Decorative "random" sections drawn from it repeat within the period, so a rerun
+    with unchanged inputs produces the same file and the write can be skipped.
+    """
+    now = now or datetime.now()
+    return random.Random(f'{name}:{now.strftime(period)}')
+
+def content_hash(content, volatile_patterns=()):
+    """Hash content with volatile regions (timestamps, counters) blanked out"""
+    for pattern in volatile_patterns:
+        content = re.sub(pattern, '', content)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def file_hash(path, volatile_patterns=()):
+    """Hash an existing file the same way, or None if it cannot be read"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return content_hash(f.read(), volatile_patterns)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def write_if_changed(path, content, volatile_patterns=()):
+    """Write content atomically unless it matches the file outside volatile regions"""
+    if file_hash(path, volatile_patterns) == content_hash(content, volatile_patterns):
+        return False
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+class StreamingWriter:
+    """Write chunks to a temp file as they arrive and rename it into place on close"""
+
+    def __init__(self, path, volatile_patterns=()):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.volatile_patterns = volatile_patterns
+        self._digest = hashlib.sha256()
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.changed = None
+
+    def write(self, chunk):
+        """Persist one chunk (volatile patterns must not span chunk boundaries)"""
+        self._file.write(chunk)
+        self._file.flush()
+        for pattern in self.volatile_patterns:
+            chunk = re.sub(pattern, '', chunk)
+        self._digest.update(chunk.encode('utf-8'))
+
+    def commit(self):
+        """Atomically replace the target, or discard the temp file if nothing meaningful changed"""
+        self._file.close()
+        self.changed = file_hash(self.path, self.volatile_patterns) != self._digest.hexdigest()
+        if self.changed:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+        return self.changed
+
+    def abort(self):
+        """Drop the partial temp file, leaving the target untouched"""
+        self._file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+def write_stream(path, chunks, volatile_patterns=(), echo=None):
+    """Stream chunks into path (optionally echoing them to a text stream); returns whether it changed"""
+    with StreamingWriter(path, volatile_patterns) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            if echo is not None:
+                echo.write(chunk)
+                echo.flush()
+    return writer.changed
+
+def exit_status(changed):
+    """Map a write result to the exit status workflows use to skip git steps"""
+    return EXIT_CHANGED if changed else EXIT_UNCHANGED
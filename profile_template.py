@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profile README Templates
+Small template engine: layouts are compiled once and rendered into a list buffer
+"""
+
+import os
+import re
+import sys
+import time
+import random
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+DEFAULT_TEMPLATE = os.path.join(TEMPLATE_DIR, 'profile_readme.md')
+
+# {{ value.path|filter:arg }}, {% for item in items %} / {% empty %} / {% endfor %}
+# and {% if [not] value.path %} / {% else %} / {% endif %}
+TOKEN_RE = re.compile(r'{{\s*(.+?)\s*}}|{%\s*(.+?)\s*%}\n?')
+
+class TemplateError(Exception):
+    pass
+
+def _truncate(value, length):
+    length = int(length)
+    return value[:length] + '...' if len(value) > length else value
+
+def _ascii(value):
+    return value.encode('ascii', 'ignore').decode('ascii')
+
+FILTERS = {
+    'truncate': _truncate,
+    'ascii': _ascii,
+    'upper': lambda value: value.upper(),
+    'lower': lambda value: value.lower(),
+}
+
+def _compile_lookup(path):
+    """Turn 'repo.name' into a function reading it from the render context"""
+    first, *rest = path.split('.')
+
+    def lookup(context):
+        value = context[first]
+        for part in rest:
+            value = value[part] if isinstance(value, dict) else getattr(value, part)
+        return value
+    return lookup
+
+def _compile_variable(expression):
+    path, *filter_specs = [part.strip() for part in expression.split('|')]
+    lookup = _compile_lookup(path)
+    filters = []
+    for spec in filter_specs:
+        name, _, arg = spec.partition(':')
+        if name not in FILTERS:
+            raise TemplateError(f"Unknown filter '{name}'")
+        filters.append((FILTERS[name], (arg,) if arg else ()))
+
+    def render(context, emit):
+        value = str(lookup(context))
+        for func, args in filters:
+            value = func(value, *args)
+        emit(value)
+    return render
+
+def _compile_text(text):
+    def render(context, emit):
+        emit(text)
+    return render
+
+def _compile_loop(var, iterable, body, empty):
+    lookup = _compile_lookup(iterable)
+
+    def render(context, emit):
+        items = lookup(context)
+        if not items:
+            for op in empty:
+                op(context, emit)
+            return
+        scope = dict(context)
+        for item in items:
+            scope[var] = item
+            for op in body:
+                op(scope, emit)
+    return render
+
+def _compile_condition(expression, negate, body, orelse):
+    lookup = _compile_lookup(expression)
+
+    def render(context, emit):
+        for op in (body if bool(lookup(context)) != negate else orelse):
+            op(context, emit)
+    return render
+
+def compile_template(source):
+    """Parse template source into a flat list of render operations"""
+    root = []
+    # Stack of (ops list being filled, block header) for nested loops and conditions
+    stack = [(root, None)]
+    position = 0
+
+    for match in TOKEN_RE.finditer(source):
+        ops = stack[-1][0]
+        if match.start() > position:
+            ops.append(_compile_text(source[position:match.start()]))
+        position = match.end()
+
+        if match.group(1) is not None:
+            ops.append(_compile_variable(match.group(1)))
+            continue
+
+        words = match.group(2).split()
+        header = stack[-1][1]
+        tag = header and header['tag']
+        if words[0] == 'for' and len(words) == 4 and words[2] == 'in':
+            stack.append(([], {'tag': 'for', 'var': words[1], 'iterable': words[3], 'body': None}))
+        elif words[0] == 'if' and len(words) in (2, 3) and (len(words) == 2 or words[1] == 'not'):
+            stack.append(([], {'tag': 'if', 'expression': words[-1], 'negate': len(words) == 3, 'body': None}))
+        elif (words == ['empty'] and tag == 'for' or words == ['else'] and tag == 'if') and header['body'] is None:
+            header['body'] = stack.pop()[0]
+            stack.append(([], header))
+        elif words == ['endfor'] and tag == 'for' or words == ['endif'] and tag == 'if':
+            ops, header = stack.pop()
+            body, rest = (header['body'], ops) if header['body'] is not None else (ops, [])
+            if tag == 'for':
+                stack[-1][0].append(_compile_loop(header['var'], header['iterable'], body, rest))
+            else:
+                stack[-1][0].append(_compile_condition(header['expression'], header['negate'], body, rest))
+        else:
+            raise TemplateError(f"Unexpected tag '{{% {match.group(2)} %}}'")
+
+    if len(stack) > 1:
+        raise TemplateError(f"Unclosed {{% {stack[-1][1]['tag']} %}} block")
+    if position < len(source):
+        root.append(_compile_text(source[position:]))
+    return root
+
+class Template:
+    """A compiled template; render() fills a list buffer and joins once"""
+
+    def __init__(self, source):
+        self.ops = compile_template(source)
+
+    def render(self, context):
+        buffer = []
+        emit = buffer.append
+        for op in self.ops:
+            op(context, emit)
+        return ''.join(buffer)
+
+_compiled = {}
+
+def load_template(path=DEFAULT_TEMPLATE):
+    """Load and compile a template file, reusing the compiled form until the file changes"""
+    mtime = os.path.getmtime(path)
+    cached = _compiled.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        template = Template(f.read())
+    _compiled[path] = (mtime, template)
+    return template
+
+def _synthetic_context(repo_count=3):
+    """Build a render context shaped like generate_profile_readme()'s"""
+    return {
+        'username': 'benchmark-user',
+        'bio': 'Building cool stuff!',
+        'location': 'Internet',
+        'streak': {'current_streak': 42, 'longest_streak': 120, 'total_contributions': 1500},
+        'activity': '\n    '.join(''.join(random.choice('_+*#@') for _ in range(7)) for _ in range(12)),
+        'tech_stack': ''.join(f"{name:<15} {'#' * 15}{'-' * 5} 75%\n" for name in ('Python', 'JavaScript', 'Go')),
+        'repos': [{
+            'name': f'repo-{i}',
+            'description': 'A fairly long repository description with unicode ✨ ' * 4,
+            'stars': i * 7,
+            'language': 'Python',
+            'url': f'https://github.com/benchmark-user/repo-{i}',
+        } for i in range(repo_count)],
+        'summary': {
+            'count': repo_count,
+            'stars': repo_count * 7,
+            'forks': repo_count,
+            'top_starred': [{'name': f'repo-{i}', 'url': f'https://github.com/benchmark-user/repo-{i}',
+                             'stars': i * 7, 'forks': i} for i in reversed(range(min(repo_count, 3)))],
+            'recently_pushed': [],
+            'unavailable': False,
+        },
+        'quote': '"Simplicity is prerequisite for reliability." - Edsger Dijkstra',
+        'joke': 'There are 10 kinds of people in the world.',
+        'updated': 'January 01, 2026 at 00:00 UTC',
+        'commit_number': 1234,
+    }
+
+def benchmark(renders=10000, repo_count=3, path=DEFAULT_TEMPLATE):
+    """Time compiling the template once and rendering it many times"""
+    start = time.perf_counter()
+    template = Template(open(path, 'r', encoding='utf-8').read())
+    compile_time = time.perf_counter() - start
+
+    contexts = [_synthetic_context(repo_count) for _ in range(16)]
+    start = time.perf_counter()
+    for i in range(renders):
+        template.render(contexts[i % len(contexts)])
+    render_time = time.perf_counter() - start
+
+    print(f"Template: {path}")
+    print(f"Compile: {compile_time * 1000:.2f} ms")
+    print(f"Render:  {renders} renders with {repo_count} repos in {render_time:.3f}s "
+          f"({render_time / renders * 1e6:.1f} us/render)")
+    return render_time
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--bench':
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        repos = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+        benchmark(count, repos)
+    else:
+        print("Usage: profile_template.py --bench [RENDERS] [REPOS]")
+        sys.exit(1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run Profiling
+Per-phase timing spans with tracemalloc peaks, exported as Chrome trace events
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+class Profiler:
+    """Collects nested timing spans; memory peaks are process-wide, so concurrent spans overlap"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+        self._origin = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def _span(self, name, category):
+        stack = self._stack()
+        current, peak = tracemalloc.get_traced_memory()
+        # Fold the peak seen so far into the parent before resetting it for this span
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        frame = {'peak': current, 'start_mem': current}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+            with self._lock:
+                self.events.append({
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': round((start - self._origin) * 1e6, 1),
+                    'dur': round((end - start) * 1e6, 1),
+                    'pid': os.getpid(),
+                    'tid': threading.get_ident(),
+                    'args': {
+                        'peak_kb': round(frame['peak'] / 1024, 1),
+                        'alloc_kb': round((frame['peak'] - frame['start_mem']) / 1024, 1),
+                    },
+                })
+
+    def span(self, name, category='phase'):
+        """Context manager timing one phase (a no-op while profiling is off)"""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, category)
+
+    def wrap(self, name, func, category='phase'):
+        """Wrap a callable so each call is recorded as a span (e.g. for thread pool tasks)"""
+        def wrapped(*args, **kwargs):
+            with self.span(name, category):
+                return func(*args, **kwargs)
+        return wrapped
+
+    def write_chrome_trace(self, path):
+        """Write trace-event JSON loadable in chrome://tracing or Perfetto"""
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event['ts'])
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=1)
+
+    def print_summary(self, stream=None):
+        """Short per-phase table (calls, total/max time, memory peak) on stderr"""
+        stream = stream or sys.stderr
+        with self._lock:
+            events = list(self.events)
+        rows = {}
+        for event in events:
+            row = rows.setdefault(event['name'], {'calls': 0, 'total': 0.0, 'max': 0.0, 'peak': 0.0, 'first': event['ts']})
+            row['calls'] += 1
+            row['total'] += event['dur'] / 1000
+            row['max'] = max(row['max'], event['dur'] / 1000)
+            row['peak'] = max(row['peak'], event['args']['peak_kb'])
+            row['first'] = min(row['first'], event['ts'])
+
+        print(f"\n{'phase':<28} {'calls':>5} {'total ms':>10} {'max ms':>10} {'peak KB':>10}", file=stream)
+        print('-' * 67, file=stream)
+        for name, row in sorted(rows.items(), key=lambda item: item[1]['first']):
+            print(f"{name:<28} {row['calls']:>5} {row['total']:>10.2f} {row['max']:>10.2f} {row['peak']:>10.1f}", file=stream)
+
+    def finish(self, path):
+        """Write the trace and print the summary"""
+        self.write_chrome_trace(path)
+        self.print_summary()
+        print(f"Trace written to {path}", file=sys.stderr)
+
+profiler = Profiler()
+
+def span(name, category='phase'):
+    """Time a phase on the shared profiler"""
+    return profiler.span(name, category)
+
+def wrap(name, func, category='phase'):
+    return profiler.wrap(name, func, category)
+
+def trace_path_from_argv(argv, default):
+    """Return the trace path for --profile / --profile=PATH, or None if profiling wasn't requested"""
+    for arg in argv:
+        if arg == '--profile':
+            return default
+        if arg.startswith('--profile='):
+            return arg.split('=', 1)[1] or default
+    return None
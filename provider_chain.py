@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Provider Chains
+Hedged requests across fallback endpoints with per-endpoint circuit breakers
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import http_client
+import metrics
+import file_lock
+
+ENDPOINT_STATE_FILE = os.getenv('ENDPOINT_STATE_FILE', os.path.join('.cache', 'endpoints.json'))
+REQUEST_TIMEOUT = 10
+
+FAILURE_THRESHOLD = 3  # consecutive failures before an endpoint's circuit opens
+COOLDOWN = 6 * 3600  # seconds an open circuit is skipped before a trial request
+LATENCY_HISTORY = 20  # successful latencies kept per endpoint
+
+# Hedge delay: p95 of the primary's recent latency, clamped to this range
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_DELAY = 0.3
+MAX_HEDGE_DELAY = 5.0
+
+class Endpoint:
+    """One upstream URL plus a parser that turns its JSON into a value (or None)"""
+
+    def __init__(self, name, url, parse):
+        self.name = name
+        self.url = url
+        self.parse = parse
+
+    def fetch(self, timeout=REQUEST_TIMEOUT):
+        response = http_client.get(self.url, timeout=timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"{self.name} returned {response.status_code}")
+        value = self.parse(response.json())
+        if not value:
+            raise RuntimeError(f"{self.name} returned no usable content")
+        return value
+
+class CircuitBreakers:
+    """Per-endpoint failure counts and latency history, persisted between runs"""
+
+    def __init__(self, path=None, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.path = path or ENDPOINT_STATE_FILE
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = self._load()
+        self._trials = set()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _refresh(self):
+        """Pick up what other processes recorded since we last read the file (call under the file lock)"""
+        self._state.update(self._load())
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Thread ids repeat across forked batch workers, so the pid keeps tmp files apart
+        tmp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _entry(self, name):
+        return self._state.setdefault(name, {'failures': 0, 'opened_at': None, 'latencies': []})
+
+    def allow(self, name):
+        """Closed circuits always pass; an open one allows a single trial after the cool-down"""
+        with self._lock:
+            entry = self._entry(name)
+            if entry['opened_at'] is None:
+                return True
+            if time.time() - entry['opened_at'] >= self.cooldown and name not in self._trials:
+                self._trials.add(name)
+                return True
+            return False
+
+    def record_success(self, name, latency):
+        with self._lock, file_lock.locked(self.path):
+            self._refresh()
+            entry = self._entry(name)
+            entry['failures'] = 0
+            entry['opened_at'] = None
+            entry['latencies'] = (entry['latencies'] + [round(latency, 3)])[-LATENCY_HISTORY:]
+            self._trials.discard(name)
+            self._save()
+
+    def record_failure(self, name):
+        with self._lock, file_lock.locked(self.path):
+            self._refresh()
+            entry = self._entry(name)
+            entry['failures'] += 1
+            if entry['failures'] >= self.threshold or name in self._trials:
+                entry['opened_at'] = time.time()
+            self._trials.discard(name)
+            self._save()
+
+    def hedge_delay(self, name):
+        """How long to wait on this endpoint before also asking the next one"""
+        with self._lock:
+            latencies = sorted(self._entry(name)['latencies'])
+        if not latencies:
+            return DEFAULT_HEDGE_DELAY
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return max(MIN_HEDGE_DELAY, min(MAX_HEDGE_DELAY, p95))
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._state))
+
+_breakers = None
+_breakers_lock = threading.Lock()
+
+def get_breakers():
+    """Return the shared circuit breaker state, loading it on first use"""
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers()
+    return _breakers
+
+class ProviderChain:
+    """Ask endpoints in order, hedging to the next one when the current one is slow"""
+
+    def __init__(self, endpoints, breakers=None):
+        self.endpoints = endpoints
+        self._breakers = breakers
+
+    @property
+    def breakers(self):
+        return self._breakers or get_breakers()
+
+    def _attempt(self, endpoint, deadline):
+        start = time.monotonic()
+        timeout = max(0.1, min(REQUEST_TIMEOUT, deadline - start))
+        try:
+            value = endpoint.fetch(timeout)
+        except Exception as e:
+            metrics.record_error(endpoint.name, e, time.monotonic() - start)
+            self.breakers.record_failure(endpoint.name)
+            raise
+        latency = time.monotonic() - start
+        metrics.record_fetch(endpoint.name, metrics.SUCCESS, latency)
+        self.breakers.record_success(endpoint.name, latency)
+        return value
+
+    def fetch(self, deadline=None):
+        """Return the first successful value before the (monotonic) deadline, or None"""
+        if deadline is None:
+            deadline = time.monotonic() + REQUEST_TIMEOUT * len(self.endpoints)
+        candidates = [endpoint for endpoint in self.endpoints if self.breakers.allow(endpoint.name)]
+        if not candidates:
+            return None
+
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        pending = {}
+        launched = 0
+        try:
+            while True:
+                if not pending and launched < len(candidates):
+                    endpoint = candidates[launched]
+                    pending[executor.submit(self._attempt, endpoint, deadline)] = endpoint
+                    launched += 1
+                if not pending:
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                # Hedge: don't wait longer than the newest request's usual latency if a fallback is left
+                newest = candidates[launched - 1]
+                timeout = min(remaining, self.breakers.hedge_delay(newest.name)) if launched < len(candidates) else remaining
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    pending.pop(future)
+                    if future.exception() is None:
+                        return future.result()
+                # Either the hedge delay expired or a request failed: bring in the next endpoint
+                if launched < len(candidates):
+                    endpoint = candidates[launched]
+                    pending[executor.submit(self._attempt, endpoint, deadline)] = endpoint
+                    launched += 1
+        finally:
+            # Losing requests finish in the background and still update their breaker
+            executor.shutdown(wait=False)
+
+if __name__ == "__main__":
+    state = get_breakers().snapshot()
+    if not state:
+        print("No endpoint history recorded yet")
+        sys.exit(0)
+    now = time.time()
+    for name, entry in sorted(state.items()):
+        if entry['opened_at'] is None:
+            status = 'closed'
+        else:
+            left = COOLDOWN - (now - entry['opened_at'])
+            status = f"open ({int(left // 60)}m left)" if left > 0 else 'half-open'
+        delay = get_breakers().hedge_delay(name)
+        print(f"{name:<20} {status:<18} failures={entry['failures']} hedge={delay:.2f}s samples={len(entry['latencies'])}")
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Job Runner
+Runs the activity, auto-update and profile jobs in one process, once or on a cron schedule
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+import http_client
+import output_writer
+import profiling
+import metrics
+
+JOB_NAMES = ('activity', 'auto-update', 'profile')
+
+# Same times as the GitHub Actions workflows (UTC)
+DEFAULT_SCHEDULE = {
+    'activity': '0 8,12,16,20 * * *',
+    'auto-update': '0 * * * *',
+    'profile': '0 */6 * * *',
+}
+DEFAULT_JITTER = 30  # seconds of random delay per scheduled run
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def run_activity():
+    """Append an activity entry and refresh the daily notes"""
+    import daily_activity
+    import activity_store
+    legacy_existed = os.path.exists(activity_store.LEGACY_LOG_FILE)
+    entry = daily_activity.update_activity_file()
+    if daily_activity.ACTIVITY_STORE == 'ring':
+        import activity_ring
+        files = [activity_ring.RING_FILE, activity_ring.STRINGS_FILE]
+    else:
+        files = [activity_store.ACTIVITY_LOG_FILE]
+    if legacy_existed and not os.path.exists(activity_store.LEGACY_LOG_FILE):
+        files.append(activity_store.LEGACY_LOG_FILE)
+    if daily_activity.update_daily_notes():
+        files.append(daily_activity.DAILY_NOTES_FILE)
+    print(f"[activity] Logged: {entry['description']}")
+    return {'changed': True, 'files': files, 'commit_message': entry['description']}
+
+def run_auto_update(echo=None):
+    """Regenerate AUTO_UPDATE.md"""
+    import auto_update
+    with profiling.span('write:stream'):
+        changed = output_writer.write_stream(
+            auto_update.OUTPUT_FILE, auto_update.iter_content(), auto_update.VOLATILE_PATTERNS, echo=echo
+        )
+    print(f"[auto-update] {auto_update.OUTPUT_FILE} {'updated' if changed else 'unchanged'}")
+    return {
+        'changed': changed,
+        'files': [auto_update.OUTPUT_FILE] if changed else [],
+        'commit_message': f"🤖 Automated hourly update - {_now()}",
+    }
+
+def run_profile():
+    """Regenerate the profile README"""
+    import update_profile
+    content = update_profile.generate_profile_readme()
+    with profiling.span('write:readme'):
+        changed = output_writer.write_if_changed(update_profile.OUTPUT_FILE, content, update_profile.VOLATILE_PATTERNS)
+    print(f"[profile] {update_profile.OUTPUT_FILE} {'updated' if changed else 'unchanged'}")
+    return {
+        'changed': changed,
+        'files': [update_profile.OUTPUT_FILE] if changed else [],
+        'commit_message': f"🤖 Auto-update profile - {_now()}",
+    }
+
+JOBS = {
+    'activity': run_activity,
+    'auto-update': run_auto_update,
+    'profile': run_profile,
+}
+
+def combine_messages(results):
+    """First changed job's message as the subject, the others as bullet lines"""
+    messages = [result['commit_message'] for result in results if result.get('changed')]
+    if not messages:
+        return ''
+    if len(messages) == 1:
+        return messages[0]
+    return messages[0] + '\n\n' + '\n'.join(f'- {message}' for message in messages[1:])
+
+def run_jobs(names, echo=None):
+    """Run jobs in order, sharing one HTTP session and cache; a failing job doesn't stop the rest"""
+    results = []
+    for name in names:
+        start = time.perf_counter()
+        try:
+            with profiling.span(f'job:{name}'):
+                result = JOBS[name](echo) if name == 'auto-update' else JOBS[name]()
+            result['error'] = None
+        except Exception as e:
+            print(f"[{name}] Error: {e}", file=sys.stderr)
+            result = {'changed': False, 'files': [], 'commit_message': '', 'error': str(e)}
+        result['job'] = name
+        result['seconds'] = time.perf_counter() - start
+        results.append(result)
+    return {
+        'results': results,
+        'changed': any(result['changed'] for result in results),
+        'failed': [result['job'] for result in results if result['error']],
+        'files': [path for result in results for path in result['files']],
+        'commit_message': combine_messages(results),
+    }
+
+def write_github_output(summary, path=None):
+    """Expose changed / files / commit_message as step outputs"""
+    path = path or os.getenv('GITHUB_OUTPUT')
+    if not path:
+        return
+    delimiter = f'EOF_{random.getrandbits(64):016x}'
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f"changed={'true' if summary['changed'] else 'false'}\n")
+        f.write(f"files={' '.join(summary['files'])}\n")
+        f.write(f"commit_message<<{delimiter}\n{summary['commit_message']}\n{delimiter}\n")
+
+CRON_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),  # 0 and 7 are both Sunday
+)
+CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+class CronError(ValueError):
+    pass
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        spec, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if spec == '*':
+            start, end = low, high
+        elif '-' in spec:
+            start, end = (int(value) for value in spec.split('-', 1))
+        else:
+            start = int(spec)
+            end = high if step > 1 else start
+        if step < 1 or start < low or end > high or start > end:
+            raise CronError(f"'{part}' is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronExpression:
+    """Standard five-field cron (minute hour day month weekday), evaluated in UTC"""
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise CronError(f"'{expression}' needs 5 fields")
+        try:
+            parsed = [_parse_field(text, low, high) for text, (_, low, high) in zip(fields, CRON_FIELDS)]
+        except ValueError as e:
+            raise CronError(f"Invalid cron expression '{expression}': {e}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        # Like cron: when both are restricted, either one matching is enough
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment):
+        """First matching minute strictly after `moment`"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise CronError(f"'{self.expression}' never matches")
+
+def _git(*args):
+    return subprocess.run(['git'] + list(args), capture_output=True, text=True)
+
+def commit_and_push(summary, push=False):
+    """Commit the changed files like the workflows do, retrying the push once after a rebase"""
+    if not summary['changed'] or not summary['files']:
+        return False
+    _git('add', '-A', '--', *summary['files'])
+    if _git('diff', '--staged', '--quiet').returncode == 0:
+        return False
+    result = _git('commit', '-m', summary['commit_message'])
+    if result.returncode != 0:
+        print(f"[WARN] git commit failed: {result.stderr.strip()[:200]}", file=sys.stderr)
+        return False
+    if push:
+        _git('pull', '--rebase')
+        if _git('push').returncode != 0:
+            _git('pull', '--rebase')
+            if _git('push').returncode != 0:
+                print("[WARN] git push failed twice; will retry with the next run", file=sys.stderr)
+    return True
+
+def run_scheduler(schedule, jitter=DEFAULT_JITTER, commit=False, push=False, max_runs=None):
+    """Run each job at its cron times (plus random jitter) until interrupted"""
+    crons = {name: CronExpression(expression) for name, expression in schedule.items()}
+
+    def plan(name, after):
+        return crons[name].next_after(after) + timedelta(seconds=random.uniform(0, jitter))
+
+    now = datetime.now(timezone.utc)
+    due = {name: plan(name, now) for name in crons}
+    for name, when in sorted(due.items(), key=lambda item: item[1]):
+        print(f"[scheduler] {name:<12} '{crons[name].expression}' next at {when:%Y-%m-%d %H:%M:%S} UTC")
+
+    runs = 0
+    while max_runs is None or runs < max_runs:
+        name, when = min(due.items(), key=lambda item: item[1])
+        wait = (when - datetime.now(timezone.utc)).total_seconds()
+        if wait > 0:
+            time.sleep(wait)
+        # Jobs due together run back to back and share one commit
+        now = datetime.now(timezone.utc)
+        batch = [job for job in JOB_NAMES if job in due and due[job] <= now]
+        summary = run_jobs(batch)
+        if commit:
+            commit_and_push(summary, push)
+        metrics.write_textfile(script='runner')
+        for job in batch:
+            due[job] = plan(job, now)
+        print(f"[scheduler] {name} done; next run of {name} at {due[name]:%Y-%m-%d %H:%M:%S} UTC")
+        runs += 1
+
+def parse_schedule(overrides, jobs):
+    schedule = {name: DEFAULT_SCHEDULE[name] for name in jobs}
+    for override in overrides or []:
+        name, _, expression = override.partition('=')
+        if name not in DEFAULT_SCHEDULE or not expression:
+            raise CronError(f"Expected JOB=EXPRESSION with JOB in {', '.join(JOB_NAMES)}, got '{override}'")
+        schedule[name] = expression
+    return schedule
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the update jobs in a single process")
+    parser.add_argument('jobs', nargs='*', metavar='JOB',
+                        help=f"Jobs to run: {', '.join(JOB_NAMES)} (default: all)")
+    parser.add_argument('--exit-status', action='store_true',
+                        help=f"Exit with {output_writer.EXIT_UNCHANGED} when no job changed anything")
+    parser.add_argument('--echo', action='store_true', help="Echo AUTO_UPDATE.md to stdout while it is generated")
+    parser.add_argument('--commit', action='store_true', help="git commit the changed files after running")
+    parser.add_argument('--push', action='store_true', help="Push after committing (implies --commit)")
+    parser.add_argument('--profile', nargs='?', const='runner.trace.json', metavar='TRACE',
+                        help="Time each phase and write a Chrome trace (default: runner.trace.json)")
+    parser.add_argument('--metrics', default=None, metavar='PATH',
+                        help=f"Prometheus textfile to write after the run (default: {metrics.textfile_path('runner')})")
+    parser.add_argument('--schedule', action='store_true', help="Stay running and execute jobs on their cron schedule")
+    parser.add_argument('--cron', action='append', metavar='JOB=EXPR',
+                        help="Override a job's schedule, e.g. --cron 'profile=30 */4 * * *'")
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER,
+                        help=f"Max random delay in seconds added to each scheduled run (default: {DEFAULT_JITTER})")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.jobs if name not in JOB_NAMES]
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(unknown)}")
+    args.jobs = [name for name in JOB_NAMES if name in args.jobs] or list(JOB_NAMES)
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.profile:
+        profiling.profiler.enable()
+
+    if args.schedule:
+        try:
+            run_scheduler(parse_schedule(args.cron, args.jobs), args.jitter, args.commit or args.push, args.push)
+        except CronError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\nScheduler stopped")
+        finally:
+            http_client.close()
+        sys.exit(0)
+
+    try:
+        summary = run_jobs(args.jobs, echo=sys.stdout if args.echo else None)
+    finally:
+        metrics.write_textfile(args.metrics, script='runner')
+        http_client.close()
+
+    write_github_output(summary)
+    if args.commit or args.push:
+        commit_and_push(summary, args.push)
+    if args.profile:
+        profiling.profiler.finish(args.profile)
+
+    if summary['commit_message']:
+        print(f"\nCommit message: {summary['commit_message'].splitlines()[0]}")
+    if summary['failed']:
+        print(f"Failed jobs: {', '.join(summary['failed'])}")
+        sys.exit(1)
+    if args.exit_status:
+        sys.exit(output_writer.exit_status(summary['changed']))
@@ -11,8 +11,18 @@ import json
 import subprocess
 from datetime import datetime
 import requests
+import http_client
+import http_cache
+import github_client
 import time
 import io
+import argparse
+import threading
+import statistics
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+import file_watch
+import workflow_runs
 
 # Force UTF-8 encoding for all I/O operations
 if sys.platform == 'win32':
@@ -21,7 +31,14 @@ if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 GITHUB_USERNAME = "Drakaniia"  # Change this to your username
-GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')  # Optional: for API rate limits
+DEFAULT_JOBS = 8  # checks run at once; most of them wait on subprocesses or the network
+MONITOR_INTERVAL = 300  # seconds between status summaries in monitor mode
+MONITORED_FILES = {  # file: hours before it counts as overdue
+    'README.md': 6,
+    'AUTO_UPDATE.md': 1,
+    'ACTIVITY_LOG.jsonl': 24,
+}
+INTERVAL_HISTORY = 50  # update intervals kept per file
 
 class Colors:
     GREEN = '\033[92m'
@@ -114,6 +131,21 @@ def test_json_valid(filename):
         print_error(f"{filename} JSON error: {str(e)[:100]}")
         return False
 
+def test_jsonl_valid(filename):
+    """Test if every line of a JSON Lines file is valid JSON"""
+    try:
+        count = 0
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    json.loads(line)
+                    count += 1
+        print_success(f"{filename} is valid JSON Lines with {count} entries")
+        return True
+    except Exception as e:
+        print_error(f"{filename} JSON error: {str(e)[:100]}")
+        return False
+
 def test_workflow_file(filename):
     """Test if workflow file is valid"""
     if not test_file_exists(filename):
@@ -176,18 +208,116 @@ def test_python_script(script_name, python_cmd):
         print_error(f"{script_name} error: {str(e)[:100]}")
         return False
 
+SCRIPT_JOBS = {
+    'daily_activity.py': 'activity',
+    'auto_update.py': 'auto-update',
+    'update_profile.py': 'profile',
+}
+
+class ScriptSandbox:
+    """Point the generator modules' files at a temp dir and their HTTP calls at a local mock server
+    
+    Module globals are patched in place, so only one sandboxed script may run at a time.
+    """
+    
+    def __init__(self, username=GITHUB_USERNAME):
+        self.username = username
+        self.directory = None
+        self.server = None
+        self._saved = []
+    
+    def path(self, name):
+        return os.path.join(self.directory, name)
+    
+    def _patch(self, module, name, value):
+        self._saved.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+    
+    def __enter__(self):
+        import tempfile
+        import shutil
+        import activity_store
+        import activity_ring
+        import daily_activity
+        import auto_update
+        import update_profile
+        import content_pool
+        import git_streak
+        import github_languages
+        import provider_chain
+        import metrics
+        from mock_api_server import MockAPIServer, FIXTURE_USERS
+    
+        self.directory = tempfile.mkdtemp(prefix='repo_generator_test_')
+        if os.path.exists(activity_store.ACTIVITY_LOG_FILE):
+            shutil.copy(activity_store.ACTIVITY_LOG_FILE, self.path('ACTIVITY_LOG.jsonl'))
+        cache = self.path('.cache')
+        files = [
+            (activity_store, 'ACTIVITY_LOG_FILE', self.path('ACTIVITY_LOG.jsonl')),
+            (activity_store, 'LEGACY_LOG_FILE', self.path('ACTIVITY_LOG.json')),
+            (activity_ring, 'RING_FILE', self.path('ACTIVITY_LOG.ring')),
+            (activity_ring, 'STRINGS_FILE', self.path('ACTIVITY_LOG.strings')),
+            (daily_activity, 'DAILY_NOTES_FILE', self.path('DAILY_NOTES.md')),
+            (auto_update, 'OUTPUT_FILE', self.path('AUTO_UPDATE.md')),
+            (update_profile, 'OUTPUT_FILE', self.path('README.md')),
+            (content_pool, 'CONTENT_POOL_FILE', os.path.join(cache, 'content_pool.db')),
+            (git_streak, 'STREAK_CACHE_FILE', os.path.join(cache, 'streak.json')),
+            (github_languages, 'LANGUAGES_CACHE_FILE', os.path.join(cache, 'languages.json')),
+            (http_cache, 'CACHE_DIR', os.path.join(cache, 'http')),
+            (provider_chain, 'ENDPOINT_STATE_FILE', os.path.join(cache, 'endpoints.json')),
+            (metrics, 'METRICS_DIR', cache),
+        ]
+        for module, name, value in files:
+            self._patch(module, name, value)
+        # Shared objects built from the old paths (or holding another run's budget) start fresh
+        for module, name in [(http_cache, '_cache'), (provider_chain, '_breakers'), (github_client, '_client')]:
+            self._patch(module, name, None)
+    
+        users = dict(FIXTURE_USERS)
+        users[self.username] = {**FIXTURE_USERS['octocat'], 'login': self.username}
+        self.server = MockAPIServer(users=users, seed=0).start()
+        self._overrides = http_client.get_url_overrides()
+        http_client.set_url_overrides(self.server.url_overrides())
+        return self
+    
+    def __exit__(self, *exc):
+        import shutil
+        http_client.set_url_overrides(self._overrides)
+        self.server.stop()
+        for module, name, value in reversed(self._saved):
+            setattr(module, name, value)
+        self._saved = []
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def test_script_in_process(script_name):
+    """Run a script's job in this process against the sandbox; the tree is left untouched"""
+    import runner
+    print_info(f"Testing {script_name} (in-process sandbox)...")
+    start = time.perf_counter()
+    try:
+        with ScriptSandbox() as sandbox:
+            summary = runner.run_jobs([SCRIPT_JOBS[script_name]])
+            missing = [path for path in summary['files'] if not os.path.exists(path)]
+            requests_served = len(sandbox.server.requests)
+    except Exception as e:
+        print_error(f"{script_name} error: {str(e)[:100]}")
+        return False
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if summary['failed']:
+        error = summary['results'][0]['error'] or 'unknown error'
+        print_error(f"{script_name} failed: {error[:200]}")
+        return False
+    if missing:
+        print_error(f"{script_name} reported files it didn't write: {', '.join(missing)}")
+        return False
+    print_success(f"{script_name} ran in {elapsed_ms:.0f} ms ({requests_served} mock requests)")
+    return True
+
 def test_github_api_connection():
     """Test GitHub API connectivity"""
     try:
-        headers = {'User-Agent': 'GitHub-Profile-Tester'}
-        if GITHUB_TOKEN:
-            headers['Authorization'] = f'token {GITHUB_TOKEN}'
-        
-        response = requests.get(
-            f'https://api.github.com/users/{GITHUB_USERNAME}',
-            headers=headers,
-            timeout=10
-        )
+        response = github_client.get(f'/users/{GITHUB_USERNAME}', timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -196,10 +326,16 @@ def test_github_api_connection():
             print_info(f"  Public repos: {data.get('public_repos')}")
             print_info(f"  Followers: {data.get('followers')}")
             
-            # Check rate limit
-            remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-            limit = int(response.headers.get('X-RateLimit-Limit', 60))
-            print_info(f"  API Rate limit: {remaining}/{limit} remaining")
+            # Check rate limit (as last seen by the client; a cache hit doesn't refresh it)
+            budget = github_client.get_client().budget() or {
+                'remaining': int(response.headers.get('X-RateLimit-Remaining', 0)),
+                'limit': int(response.headers.get('X-RateLimit-Limit', 60)),
+            }
+            remaining = budget['remaining']
+            print_info(f"  API Rate limit: {remaining}/{budget['limit']} remaining")
+            
+            cache_stats = http_cache.stats()
+            print_info(f"  HTTP cache: {cache_stats['hits']} hits, {cache_stats['revalidations']} revalidated, {cache_stats['misses']} misses")
             
             if remaining < 10:
                 print_warning("API rate limit low!")
@@ -211,10 +347,42 @@ def test_github_api_connection():
         else:
             print_error(f"GitHub API returned {response.status_code}")
             return False
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, github_client.RateLimitDeferred) as e:
         print_error(f"GitHub API connection error: {str(e)[:100]}")
         return False
 
+def test_graphql_provider():
+    """Test the batched GraphQL provider against the local stand-in server"""
+    import github_graphql
+    from mock_api_server import MockAPIServer
+    
+    try:
+        with MockAPIServer() as server:
+            profiles = github_graphql.fetch_profiles(
+                ['octocat', 'hubot', 'no-such-user'],
+                url=f'{server.url}/graphql',
+                token='test-token'
+            )
+            request_count = len(server.requests)
+        
+        octocat = profiles.get('octocat')
+        checks = [
+            request_count == 1,
+            octocat is not None and octocat['stats']['followers'] == 42,
+            octocat is not None and len(octocat['repos']) == github_graphql.REPO_COUNT,
+            octocat is not None and octocat['repos'][1]['language'] == 'Unknown',
+            profiles.get('hubot') is not None and profiles['hubot']['repos'] == [],
+            profiles.get('no-such-user', 'missing') is None,
+        ]
+        if all(checks):
+            print_success(f"GraphQL provider fetched 3 profiles in {request_count} request")
+            return True
+        print_error(f"GraphQL provider returned unexpected data ({sum(checks)}/{len(checks)} checks passed)")
+        return False
+    except Exception as e:
+        print_error(f"GraphQL provider error: {str(e)[:100]}")
+        return False
+
 def test_external_apis():
     """Test external API connectivity"""
     apis = [
@@ -226,7 +394,7 @@ def test_external_apis():
     results = []
     for name, url in apis:
         try:
-            response = requests.get(url, timeout=10)
+            response = http_client.get(url, timeout=10)
             if response.status_code == 200:
                 print_success(f"{name} accessible")
                 results.append(True)
@@ -302,13 +470,9 @@ def check_git_status():
 def get_workflow_runs():
     """Get recent workflow runs from GitHub API"""
     try:
-        headers = {'User-Agent': 'GitHub-Profile-Tester'}
-        if GITHUB_TOKEN:
-            headers['Authorization'] = f'token {GITHUB_TOKEN}'
-        
-        # Try the repo-specific endpoint
-        url = f'https://api.github.com/repos/{GITHUB_USERNAME}/{GITHUB_USERNAME}/actions/runs?per_page=5'
-        response = requests.get(url, headers=headers, timeout=10)
+        # Try the repo-specific endpoint; low priority, so it yields to the profile calls near the limit
+        url = f'/repos/{GITHUB_USERNAME}/{GITHUB_USERNAME}/actions/runs?per_page=5'
+        response = github_client.get(url, priority=github_client.LOW, cached=False, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -386,90 +550,191 @@ def check_dependencies():
     
     return True, python_cmd
 
-def generate_test_report():
-    """Generate comprehensive test report"""
-    print_header("AUTOMATION TESTING REPORT")
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends each capturing thread's prints to its own buffer"""
     
-    # Check dependencies first
-    deps_ok, python_cmd = check_dependencies()
-    if not deps_ok:
-        print_error("\n[FAIL] Dependency check failed. Please install missing dependencies.")
-        return False
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
     
-    results = {
-        'File System Tests': [],
-        'Workflow Tests': [],
-        'Script Tests': [],
-        'API Tests': [],
-        'Git Tests': []
-    }
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        (buffer if buffer is not None else self.stream).write(text)
+        return len(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def capture(self, func, *args):
+        """Call func, returning (result, everything it printed)"""
+        self.local.buffer = io.StringIO()
+        try:
+            return func(*args), self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
+
+def _print_step(text):
+    return ('print', lambda: print(text))
+
+def _header_step(text):
+    return ('print', lambda: print_header(text))
+
+def _check_step(name, category, func, *args, after=()):
+    """category None: run and report, but don't count it as a test"""
+    return ('check', name, category, func, args, tuple(after))
+
+def build_test_plan(python_cmd, subprocess_scripts=False):
+    """Report steps in output order; checks only wait on the checks listed in `after`
     
-    # File system tests
-    print_header("1. File System Tests")
+    Scripts run in-process against a sandbox unless subprocess_scripts is set, which
+    runs the real scripts on the working tree as an end-to-end check.
+    """
     files = [
         'README.md',
         'AUTO_UPDATE.md',
         'DAILY_NOTES.md',
-        'ACTIVITY_LOG.json',
+        'ACTIVITY_LOG.jsonl',
         'auto_update.py',
         'daily_activity.py',
         'update_profile.py',
+        'http_client.py',
+        'http_cache.py',
+        'github_client.py',
+        'runner.py',
+        'file_watch.py',
+        'workflow_runs.py',
+        'workflow_analytics.py',
+        'activity_store.py',
+        'templates/profile_readme.md',
         '.github/workflows/daily-activity.yml',
         '.github/workflows/hourly-update.yml',
         '.github/workflows/update-profile.yml'
     ]
-    
-    for f in files:
-        results['File System Tests'].append(test_file_exists(f))
-    
-    # Check file freshness
-    print("\nFile Update Checks:")
-    results['File System Tests'].append(test_file_updated_recently('README.md', 12))
-    results['File System Tests'].append(test_file_updated_recently('AUTO_UPDATE.md', 2))
-    results['File System Tests'].append(test_file_updated_recently('ACTIVITY_LOG.json', 24))
-    
-    # JSON validation
-    print("\nJSON Validation:")
-    results['File System Tests'].append(test_json_valid('ACTIVITY_LOG.json'))
-    
-    # Workflow tests
-    print_header("2. Workflow Configuration Tests")
     workflows = [
         '.github/workflows/daily-activity.yml',
         '.github/workflows/hourly-update.yml',
         '.github/workflows/update-profile.yml'
     ]
-    
-    for wf in workflows:
-        if os.path.exists(wf):
-            results['Workflow Tests'].append(test_workflow_file(wf))
-    
-    # Script tests
-    print_header("3. Python Script Tests")
-    print_info("Testing scripts (will execute and modify files)")
-    
     scripts = ['daily_activity.py', 'auto_update.py', 'update_profile.py']
+    
+    plan = [_header_step("1. File System Tests")]
+    plan += [_check_step(f'exists:{f}', 'File System Tests', test_file_exists, f) for f in files]
+    
+    # Freshness and validity describe the tree as found, so the scripts wait for these
+    plan.append(_print_step("\nFile Update Checks:"))
+    plan.append(_check_step('fresh:readme', 'File System Tests', test_file_updated_recently, 'README.md', 12))
+    plan.append(_check_step('fresh:auto', 'File System Tests', test_file_updated_recently, 'AUTO_UPDATE.md', 2))
+    plan.append(_check_step('fresh:activity', 'File System Tests', test_file_updated_recently, 'ACTIVITY_LOG.jsonl', 24))
+    plan.append(_print_step("\nJSON Validation:"))
+    plan.append(_check_step('jsonl:activity', 'File System Tests', test_jsonl_valid, 'ACTIVITY_LOG.jsonl'))
+    tree_checks = ['fresh:readme', 'fresh:auto', 'fresh:activity', 'jsonl:activity']
+    
+    plan.append(_header_step("2. Workflow Configuration Tests"))
+    plan += [_check_step(f'workflow:{wf}', 'Workflow Tests', test_workflow_file, wf) for wf in workflows if os.path.exists(wf)]
+    
+    plan.append(_header_step("3. Python Script Tests"))
+    script_checks = [f'script:{script}' for script in scripts]
+    if subprocess_scripts:
+        plan.append(('print', lambda: print_info("Testing scripts (will execute and modify files)")))
+    else:
+        plan.append(('print', lambda: print_info("Testing scripts in-process (sandboxed; the tree is not touched)")))
+    previous = []
     for script in scripts:
-        if os.path.exists(script):
-            results['Script Tests'].append(test_python_script(script, python_cmd))
+        name = f'script:{script}'
+        if not os.path.exists(script):
+            plan.append(_check_step(name, 'Script Tests', _missing_script, script))
+        elif subprocess_scripts:
+            plan.append(_check_step(name, 'Script Tests', test_python_script, script, python_cmd, after=tree_checks))
         else:
-            print_error(f"{script} not found")
-            results['Script Tests'].append(False)
+            # The sandbox patches module globals, so in-process scripts run one after another
+            plan.append(_check_step(name, 'Script Tests', test_script_in_process, script, after=tree_checks + previous))
+            previous = [name]
+    
+    # In-process scripts redirect every HTTP call to the mock server until they finish
+    api_after = [] if subprocess_scripts else script_checks
+    plan.append(_header_step("4. API Connectivity Tests"))
+    plan.append(_check_step('api:github', 'API Tests', test_github_api_connection, after=api_after))
+    plan.append(_check_step('api:graphql', 'API Tests', test_graphql_provider, after=api_after))
+    plan.append(_print_step("\nExternal APIs:"))
+    plan.append(_check_step('api:external', 'API Tests', test_external_apis, after=api_after))
+    
+    # The git check reports the changes the scripts just made
+    plan.append(_header_step("5. Git Repository Tests"))
+    plan.append(_check_step('git:status', 'Git Tests', check_git_status, after=script_checks))
+    plan.append(_print_step("\nGitHub Actions Status:"))
+    plan.append(_check_step('workflow_runs', None, get_workflow_runs, after=api_after))
+    return plan
+
+def _missing_script(script):
+    print_error(f"{script} not found")
+    return False
+
+def _run_check(output, func, args, dependencies):
+    wait(dependencies)
+    
+    def guarded():
+        try:
+            return func(*args)
+        except Exception as e:
+            print_error(f"{func.__name__} crashed: {str(e)[:100]}")
+            return False
+    return output.capture(guarded)
+
+def run_test_plan(plan, jobs=DEFAULT_JOBS):
+    """Run checks on a worker pool and print their output in plan order as soon as it is ready
     
-    # API tests
-    print_header("4. API Connectivity Tests")
-    results['API Tests'].append(test_github_api_connection())
-    print("\nExternal APIs:")
-    results['API Tests'].append(test_external_apis())
+    Returns ({category: [passed, ...]}, {check name: result}).
+    """
+    output = ThreadOutput(sys.stdout)
+    results = {
+        'File System Tests': [],
+        'Workflow Tests': [],
+        'Script Tests': [],
+        'API Tests': [],
+        'Git Tests': []
+    }
+    values = {}
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            # Submitted in plan order, so a check's dependencies are always already running or done
+            futures = {}
+            for step in plan:
+                if step[0] == 'check':
+                    _, name, _, func, args, after = step
+                    futures[name] = executor.submit(_run_check, output, func, args, [futures[dep] for dep in after])
+            for step in plan:
+                if step[0] == 'print':
+                    step[1]()
+                    continue
+                _, name, category, _, _, _ = step
+                value, text = futures[name].result()
+                output.stream.write(text)
+                output.stream.flush()
+                values[name] = value
+                if category:
+                    results[category].append(bool(value))
+        if 'workflow_runs' in values:
+            results['Git Tests'].append(True)  # Always pass this
+    finally:
+        sys.stdout = output.stream
+    return results, values
+
+def generate_test_report(jobs=DEFAULT_JOBS, subprocess_scripts=False):
+    """Generate comprehensive test report"""
+    print_header("AUTOMATION TESTING REPORT")
     
-    # Git tests
-    print_header("5. Git Repository Tests")
-    results['Git Tests'].append(check_git_status())
+    # Check dependencies first
+    deps_ok, python_cmd = check_dependencies()
+    if not deps_ok:
+        print_error("\n[FAIL] Dependency check failed. Please install missing dependencies.")
+        return False
     
-    # Workflow runs
-    print("\nGitHub Actions Status:")
-    workflow_check = get_workflow_runs()
-    results['Git Tests'].append(True)  # Always pass this
+    plan = build_test_plan(python_cmd, subprocess_scripts)
+    start = time.perf_counter()
+    results, values = run_test_plan(plan, jobs)
+    elapsed = time.perf_counter() - start
+    workflow_check = values.get('workflow_runs')
     
     # Final summary
     print_header("TEST SUMMARY")
@@ -480,7 +745,8 @@ def generate_test_report():
     print(f"\nTotal Tests: {total_tests}")
     print(f"Passed: {Colors.GREEN}{passed_tests}{Colors.RESET}")
     print(f"Failed: {Colors.RED}{total_tests - passed_tests}{Colors.RESET}")
-    print(f"Success Rate: {(passed_tests/total_tests*100):.1f}%\n")
+    print(f"Success Rate: {(passed_tests/total_tests*100):.1f}%")
+    print(f"Duration: {elapsed:.1f}s with up to {jobs} parallel checks\n")
     
     for category, tests in results.items():
         passed = sum(tests)
@@ -519,56 +785,202 @@ def generate_test_report():
     
     return passed_tests == total_tests
 
-def continuous_monitor(interval=300):
-    """Continuously monitor the automation"""
-    print_header("CONTINUOUS MONITORING MODE")
-    print_info(f"Checking every {interval} seconds. Press Ctrl+C to stop.\n")
+def _format_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+class UpdateIntervals:
+    """Rolling series of the gaps between one file's updates, plus its freshness deadline"""
     
-    python_cmd = get_python_command()
-    if not python_cmd:
-        print_error("Python not found. Cannot run monitoring.")
-        return
+    def __init__(self, filename, max_age_hours, history=INTERVAL_HISTORY):
+        self.filename = filename
+        self.max_age = max_age_hours * 3600
+        self.intervals = deque(maxlen=history)
+        self.last_update = self._mtime()
+        self.alerted = False
+    
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self.filename)
+        except OSError:
+            return None
+    
+    @property
+    def deadline(self):
+        """Wall-clock time the file becomes overdue (None if it doesn't exist)"""
+        return None if self.last_update is None else self.last_update + self.max_age
+    
+    def overdue(self, now):
+        return self.deadline is None or now >= self.deadline
+    
+    def record(self):
+        """Note a change event; False if the file's mtime didn't actually move"""
+        mtime = self._mtime()
+        if mtime is None or mtime == self.last_update:
+            return False
+        if self.last_update is not None:
+            self.intervals.append(mtime - self.last_update)
+        self.last_update = mtime
+        self.alerted = False
+        return True
     
+    def describe(self):
+        if not self.intervals:
+            return "no intervals observed yet"
+        values = list(self.intervals)
+        return (f"median {_format_duration(statistics.median(values))}, "
+                f"max {_format_duration(max(values))} over {len(values)} updates")
+
+def _check_overdue(trackers, now):
+    """Alert once per overdue file until it updates again"""
+    alerts = 0
+    for tracker in trackers:
+        if tracker.overdue(now) and not tracker.alerted:
+            tracker.alerted = True
+            alerts += 1
+            if tracker.last_update is None:
+                print_error(f"{tracker.filename} is missing")
+            else:
+                late = _format_duration(now - tracker.deadline)
+                print_error(f"{tracker.filename} overdue by {late} "
+                            f"(last updated {_format_duration(now - tracker.last_update)} ago, limit {tracker.max_age // 3600}h)")
+    return alerts
+
+def _print_monitor_status(trackers, iteration):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"\n{Colors.BOLD}[{timestamp}] Check #{iteration}{Colors.RESET}")
+    passed = 0
+    for tracker in trackers:
+        if test_file_updated_recently(tracker.filename, tracker.max_age / 3600):
+            passed += 1
+        print(f"    intervals: {tracker.describe()}")
+    total = len(trackers)
+    if passed == total:
+        print_success(f"All checks passed ({passed}/{total})")
+    elif passed > 0:
+        print_warning(f"Some checks passed ({passed}/{total})")
+    else:
+        print_error(f"All checks failed ({passed}/{total})")
+
+def _poll_workflow_runs(poller):
+    """Report new or changed Actions runs; returns the number of failures seen"""
+    first = not poller.index
+    try:
+        changes = poller.poll()
+    except github_client.RateLimitDeferred as e:
+        print_warning(f"Workflow polling deferred: {e}")
+        poller.back_off(e.reset)
+        return 0
+    except Exception as e:
+        print_warning(f"Workflow polling error: {str(e)[:100]}")
+        poller.back_off()
+        return 0
+    
+    if first and changes:
+        print_info(f"Indexed {len(changes)} recent workflow runs")
+        changes = [change for change in changes if change[1]['status'] != 'completed']
+    failures = 0
+    timestamp = datetime.now().strftime('%H:%M:%S')
+    for _, run in changes:
+        line = f"[{timestamp}] {workflow_runs.describe_run(run)}"
+        if run['status'] != 'completed':
+            print_info(line)
+        elif run['conclusion'] == 'success':
+            print_success(line)
+        elif run['conclusion'] in ('cancelled', 'skipped'):
+            print_warning(line)
+        else:
+            failures += 1
+            print_error(line)
+    return failures
+
+def continuous_monitor(interval=MONITOR_INTERVAL, use_inotify=True, watch_runs=True):
+    """Watch the generated files; wake on a change or when one becomes overdue
+    
+    A status summary is still printed every `interval` seconds, but overdue
+    files are reported the moment their freshness deadline passes. Actions
+    runs are polled alongside, faster while one is in progress.
+    """
+    print_header("CONTINUOUS MONITORING MODE")
+    trackers = [UpdateIntervals(filename, hours) for filename, hours in MONITORED_FILES.items()]
+    by_path = {os.path.abspath(tracker.filename): tracker for tracker in trackers}
+    watcher = file_watch.open_watcher(list(by_path), use_inotify=use_inotify)
+    print_info(f"Watching {len(trackers)} files ({watcher.kind}); summary every {interval}s. Press Ctrl+C to stop.")
+    poller = workflow_runs.RunPoller(f'{GITHUB_USERNAME}/{GITHUB_USERNAME}') if watch_runs else None
+    
+    iteration = 1
+    updates = alerts = 0
+    _print_monitor_status(trackers, iteration)
+    next_summary = time.monotonic() + interval
+    next_poll = time.monotonic()
     try:
-        iteration = 0
         while True:
-            iteration += 1
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            print(f"\n{Colors.BOLD}[{timestamp}] Check #{iteration}{Colors.RESET}")
+            if poller and time.monotonic() >= next_poll:
+                alerts += _poll_workflow_runs(poller)
+                next_poll = time.monotonic() + poller.interval
             
-            # Quick checks
-            checks = {
-                'README (6h)': test_file_updated_recently('README.md', 6),
-                'Auto-update (1h)': test_file_updated_recently('AUTO_UPDATE.md', 1),
-                'Activity (24h)': test_file_updated_recently('ACTIVITY_LOG.json', 24),
-            }
+            now = time.time()
+            alerts += _check_overdue(trackers, now)
             
-            passed = sum(checks.values())
-            total = len(checks)
+            # Sleep until a file could go overdue, the next runs poll or the next summary
+            timeout = next_summary - time.monotonic()
+            if poller:
+                timeout = min(timeout, next_poll - time.monotonic())
+            deadlines = [tracker.deadline for tracker in trackers if not tracker.alerted and tracker.deadline]
+            if deadlines:
+                timeout = min(timeout, min(deadlines) - now)
             
-            if passed == total:
-                print_success(f"All checks passed ({passed}/{total})")
-            elif passed > 0:
-                print_warning(f"Some checks passed ({passed}/{total})")
-            else:
-                print_error(f"All checks failed ({passed}/{total})")
+            for path in watcher.wait(max(0.0, timeout)):
+                tracker = by_path[path]
+                previous = tracker.last_update
+                if not tracker.record():
+                    continue
+                updates += 1
+                timestamp = datetime.now().strftime('%H:%M:%S')
+                gap = f" after {_format_duration(tracker.last_update - previous)}" if previous is not None else ""
+                print_success(f"[{timestamp}] {tracker.filename} updated{gap} ({tracker.describe()})")
             
-            print(f"\n{Colors.BLUE}Next check in {interval}s... (Ctrl+C to stop){Colors.RESET}")
-            time.sleep(interval)
+            if time.monotonic() >= next_summary:
+                iteration += 1
+                _print_monitor_status(trackers, iteration)
+                next_summary = time.monotonic() + interval
             
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}Monitoring stopped by user{Colors.RESET}")
-        print(f"Completed {iteration} monitoring cycles")
+        print(f"Completed {iteration} monitoring cycles, saw {updates} updates, raised {alerts} alerts")
+        if poller:
+            stats = poller.stats
+            print(f"Workflow runs: {stats['polls']} polls, {stats['not_modified']} unchanged (304), {stats['changes']} run updates")
+    finally:
+        watcher.close()
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == '--monitor':
-        continuous_monitor()
+    parser = argparse.ArgumentParser(description="Test and monitor the automation")
+    parser.add_argument('--monitor', action='store_true', help="Continuous monitoring mode")
+    parser.add_argument('--interval', type=int, default=MONITOR_INTERVAL,
+                        help=f"Seconds between monitor status summaries (default: {MONITOR_INTERVAL})")
+    parser.add_argument('--poll', action='store_true', help="Monitor by polling mtimes instead of inotify")
+    parser.add_argument('--no-runs', action='store_true', help="Don't poll GitHub Actions runs in monitor mode")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f"Checks to run in parallel (default: {DEFAULT_JOBS}; 1 runs them one by one)")
+    parser.add_argument('--subprocess', action='store_true',
+                        help="Run the scripts as subprocesses on the working tree (end-to-end; modifies files)")
+    args = parser.parse_args()
+    
+    if args.monitor:
+        continuous_monitor(max(1, args.interval), use_inotify=not args.poll, watch_runs=not args.no_runs)
     else:
-        success = generate_test_report()
+        success = generate_test_report(max(1, args.jobs), args.subprocess)
         
         print(f"\n{Colors.BLUE}{'='*60}{Colors.RESET}")
         print(f"{Colors.BLUE}Options:{Colors.RESET}")
         print(f"  {sys.executable} test_automation.py           - Run full test suite")
+        print(f"  {sys.executable} test_automation.py --jobs N  - Limit parallel checks")
+        print(f"  {sys.executable} test_automation.py --subprocess - Run the real scripts on the tree")
         print(f"  {sys.executable} test_automation.py --monitor - Continuous monitoring")
         
-        sys.exit(0 if success else 1)   
\ No newline at end of file
+        sys.exit(0 if success else 1)
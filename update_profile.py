@@ -5,12 +5,26 @@ GitHub Profile Auto-Updater
 Dynamically updates your profile README with live stats, activities, and content
 """
 
-import requests
+import provider_chain
+import github_client
+import http_client
+import http_cache
+import output_writer
+import profile_template
+import git_streak
+import github_graphql
+import github_repos
+import github_languages
+import profiling
+import metrics
 import random
 from datetime import datetime
 import sys
 import io
 import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Force UTF-8 encoding for all I/O operations
 if sys.platform == 'win32':
@@ -21,37 +35,53 @@ if sys.platform == 'win32':
 # Configuration - Set your GitHub username
 GITHUB_USERNAME = "Drakaniia"  # Change this
 
+OUTPUT_FILE = 'README.md'
+# README layout; point PROFILE_TEMPLATE at your own file to customise it
+TEMPLATE_FILE = os.getenv('PROFILE_TEMPLATE', profile_template.DEFAULT_TEMPLATE)
+# Regions that change every run and shouldn't count as a content change
+VOLATILE_PATTERNS = [r'### Last Updated: .*', r'Commit #\d+']
+# The activity graph is drawn once per day per user (see output_writer.period_random)
+ACTIVITY_PERIOD = '%Y-%m-%d'
+
+def _ascii(text):
+    # Remove problematic characters
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+JOKE_PROVIDERS = provider_chain.ProviderChain([
+    provider_chain.Endpoint('jokeapi', 'https://v2.jokeapi.dev/joke/Programming?type=single',
+                            lambda data: _ascii(data.get('joke', 'Why do programmers prefer dark mode? Less bugs!'))),
+])
+QUOTE_PROVIDERS = provider_chain.ProviderChain([
+    provider_chain.Endpoint('quotable', 'https://api.quotable.io/random?tags=technology',
+                            lambda data: _ascii(f'"{data["content"]}" - {data["author"]}')),
+    provider_chain.Endpoint('zenquotes', 'https://zenquotes.io/api/random',
+                            lambda data: _ascii(f'"{data[0]["q"]}" - {data[0]["a"]}')),
+])
+
 def get_programming_joke():
     """Fetch a programming joke"""
-    try:
-        response = requests.get('https://v2.jokeapi.dev/joke/Programming?type=single', timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            joke = data.get('joke', 'Why do programmers prefer dark mode? Less bugs!')
-            # Remove problematic characters
-            return joke.encode('ascii', 'ignore').decode('ascii')
-    except:
-        pass
+    joke = JOKE_PROVIDERS.fetch()
+    if joke:
+        return joke
+    metrics.record_fallback('joke')
     return "Debugging is like being the detective in a crime movie where you're also the murderer at the same time."
 
 def get_dev_quote():
     """Fetch a developer quote"""
-    try:
-        response = requests.get('https://api.quotable.io/random?tags=technology', timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            quote = f'"{data["content"]}" - {data["author"]}'
-            return quote.encode('ascii', 'ignore').decode('ascii')
-    except:
-        pass
+    quote = QUOTE_PROVIDERS.fetch()
+    if quote:
+        return quote
+    metrics.record_fallback('quote')
     return '"Code is like humor. When you have to explain it, it\'s bad." - Cory House'
 
-def get_github_stats():
+def get_github_stats(username=GITHUB_USERNAME):
     """Fetch real GitHub stats"""
+    start = time.monotonic()
     try:
-        response = requests.get(f'https://api.github.com/users/{GITHUB_USERNAME}', timeout=10)
+        response = github_client.get(f'/users/{username}', timeout=10)
         if response.status_code == 200:
             data = response.json()
+            metrics.record_fetch('github-user', metrics.SUCCESS, time.monotonic() - start)
             return {
                 'public_repos': data.get('public_repos', 0),
                 'followers': data.get('followers', 0),
@@ -60,42 +90,55 @@ def get_github_stats():
                 'bio': data.get('bio', 'Building cool stuff!'),
                 'location': data.get('location', 'None')
             }
-    except:
-        pass
+        metrics.record_fetch('github-user', metrics.FAILURE, time.monotonic() - start)
+    except Exception as e:
+        metrics.record_error('github-user', e, time.monotonic() - start)
+    metrics.record_fallback('stats')
     return None
 
-def get_latest_repos():
-    """Fetch latest repositories"""
+# Shown when the repository listing can't be fetched; the template checks `unavailable`
+EMPTY_REPO_SUMMARY = {'count': 0, 'stars': 0, 'forks': 0, 'top_starred': [], 'recently_pushed': [],
+                      'unavailable': True}
+
+def get_profile_data(username=GITHUB_USERNAME):
+    """Fetch stats (and recent repos) in one GraphQL round trip, falling back to REST for the stats"""
+    if github_graphql.GITHUB_TOKEN:
+        start = time.monotonic()
+        try:
+            profile = github_graphql.fetch_profiles([username]).get(username)
+            if profile:
+                metrics.record_fetch('github-graphql', metrics.SUCCESS, time.monotonic() - start)
+                return profile
+            metrics.record_fetch('github-graphql', metrics.FAILURE, time.monotonic() - start)
+        except Exception as e:
+            metrics.record_error('github-graphql', e, time.monotonic() - start)
+    # Latest projects come from the repository listing's recently pushed ranking
+    return {'stats': get_github_stats(username), 'repos': []}
+
+def prefetch_profiles(usernames):
+    """Fetch many profiles with one GraphQL query per batch; empty if GraphQL is unavailable"""
+    if not github_graphql.GITHUB_TOKEN:
+        return {}
     try:
-        response = requests.get(
-            f'https://api.github.com/users/{GITHUB_USERNAME}/repos?sort=updated&per_page=5',
-            timeout=10
-        )
-        if response.status_code == 200:
-            repos = response.json()
-            return [{
-                'name': repo['name'],
-                'description': repo['description'] or 'No description',
-                'stars': repo['stargazers_count'],
-                'language': repo['language'] or 'Unknown',
-                'url': repo['html_url']
-            } for repo in repos[:3]]  # Limit to top 3
-    except:
-        pass
-    return []
+        return github_graphql.fetch_profiles(usernames)
+    except Exception as e:
+        print(f"GraphQL prefetch failed, using REST per profile: {str(e)[:100]}")
+        return {}
 
 def get_contribution_streak():
-    """Calculate contribution streak (simulated)"""
-    today = datetime.now()
-    streak_days = random.randint(7, 365)
-    return {
-        'current_streak': streak_days,
-        'longest_streak': max(streak_days, random.randint(30, 500)),
-        'total_contributions': random.randint(100, 2000)
-    }
-
-def generate_activity_graph():
+    """Calculate contribution streak from this repository's git history"""
+    try:
+        return git_streak.get_streak()
+    except Exception:
+        return {
+            'current_streak': 0,
+            'longest_streak': 0,
+            'total_contributions': 0
+        }
+
+def generate_activity_graph(username=GITHUB_USERNAME):
     """Generate ASCII activity graph"""
+    rng = output_writer.period_random(f'activity:{username}', ACTIVITY_PERIOD)
     # Use simpler characters that work across platforms
     levels = ['_', '+', '*', '#', '@']
     weeks = 12
@@ -104,156 +147,221 @@ def generate_activity_graph():
     for week in range(weeks):
         week_str = ""
         for day in range(7):
-            intensity = random.choice(levels)
+            intensity = rng.choice(levels)
             week_str += intensity
         graph += week_str + "\n    "
     
     return graph.strip()
 
-def get_tech_stack():
-    """Return dynamic tech stack with progress bars"""
-    techs = [
-        ("Python", random.randint(70, 95)),
-        ("JavaScript", random.randint(60, 90)),
-        ("React", random.randint(50, 85)),
-        ("Node.js", random.randint(55, 88)),
-        ("Docker", random.randint(45, 80)),
-        ("Git", random.randint(75, 95)),
-    ]
-    
-    result = ""
-    for tech, level in techs:
-        bar_length = 20
-        filled = int((level / 100) * bar_length)
-        bar = "#" * filled + "-" * (bar_length - filled)
-        result += f"{tech:<15} {bar} {level}%\n"
-    
-    return result
-
-def generate_profile_readme():
-    """Generate the complete profile README"""
-    now = datetime.now()
-    stats = get_github_stats()
-    repos = get_latest_repos()
-    streak = get_contribution_streak()
-    joke = get_programming_joke()
-    quote = get_dev_quote()
-    activity = generate_activity_graph()
-    tech_stack = get_tech_stack()
-    
-    bio = stats['bio'] if stats else 'Building cool stuff!'
-    location = stats['location'] if stats else 'None'
-    
-    content = f"""# Hi there, I'm {GITHUB_USERNAME}!
-
-<div align="center">
-
-![Profile Views](https://komarev.com/ghpvc/?username={GITHUB_USERNAME}&color=blueviolet&style=flat-square)
-![GitHub followers](https://img.shields.io/github/followers/{GITHUB_USERNAME}?style=social)
-![GitHub stars](https://img.shields.io/github/stars/{GITHUB_USERNAME}?style=social)
-
-</div>
-
-## About Me
-
-{bio} | Location: {location}
-
-- Currently working on making GitHub profiles more dynamic
-- Learning new technologies every day
-- Ask me about coding, automation, and tech
-- Fun fact: This README updates automatically!
-
-## GitHub Stats
-
-<div align="center">
-
-### Current Streak: **{streak['current_streak']} days**
-### Longest Streak: **{streak['longest_streak']} days**
-### Total Contributions: **{streak['total_contributions']}**
-
-</div>
-
-## Contribution Activity
-
-```
-{activity}
-```
+def get_repo_overview(username=GITHUB_USERNAME):
+    """Return (repo summary, tech stack) from a single pass over the repository listing
 
-## Tech Stack & Skills
+    Each page feeds the star/fork totals and the language fetches as it is read,
+    so the listing is only paged through once.
+    """
+    start = time.monotonic()
+    aggregates = github_repos.RepoAggregates()
+    listing = {'elapsed': None, 'error': None}
 
-```
-{tech_stack}```
+    def listed_repos():
+        for repo in github_repos.iter_repos(username):
+            aggregates.add(repo)
+            yield repo
+        listing['elapsed'] = time.monotonic() - start
 
-## Latest Projects
-"""
-
-    if repos:
-        for repo in repos:
-            # Truncate long descriptions and clean them
-            desc = repo['description'][:100]
-            if len(repo['description']) > 100:
-                desc += "..."
-            # Remove problematic characters
-            desc = desc.encode('ascii', 'ignore').decode('ascii')
-            
-            content += f"""
-### [{repo['name']}]({repo['url']})
-> {desc}
-- Stars: {repo['stars']} | Language: {repo['language']}
-"""
+    try:
+        totals, counts = github_languages.collect_languages(listed_repos())
+        metrics.record_fetch('github-languages', metrics.SUCCESS if not counts['failed'] else metrics.FAILURE,
+                             time.monotonic() - start)
+    except Exception as e:
+        listing['error'] = e
+        metrics.record_error('github-languages', e, time.monotonic() - start)
+        metrics.record_fallback('tech_stack')
+        totals = github_languages.cached_totals(username)
+
+    if listing['elapsed'] is not None:
+        metrics.record_fetch('github-repo-list', metrics.SUCCESS, listing['elapsed'])
+        summary = aggregates.summary()
     else:
-        content += "\n*Loading repositories...*\n"
-
-    content += f"""
-
-## Connect With Me
-
-[![LinkedIn](https://img.shields.io/badge/LinkedIn-0077B5?style=for-the-badge&logo=linkedin&logoColor=white)](https://linkedin.com/in/{GITHUB_USERNAME})
-[![Twitter](https://img.shields.io/badge/Twitter-1DA1F2?style=for-the-badge&logo=twitter&logoColor=white)](https://twitter.com/{GITHUB_USERNAME})
-[![Email](https://img.shields.io/badge/Email-D14836?style=for-the-badge&logo=gmail&logoColor=white)](mailto:{GITHUB_USERNAME}@example.com)
-
-## Quote of the Day
-
-> {quote}
-
-## Dev Humor
-
-{joke}
-
----
-
-<div align="center">
-
-### Last Updated: {now.strftime('%B %d, %Y at %H:%M UTC')}
-
-**This profile updates automatically every 6 hours!**
-
-![Wave](https://raw.githubusercontent.com/mayhemantt/mayhemantt/Update/svg/Bottom.svg)
-
-</div>
-
-<!-- 
-Auto-generated by GitHub Actions
-Commit #{random.randint(1000, 9999)}
--->
-"""
-
-    return content
+        # The listing itself failed part-way, so the totals would be short
+        metrics.record_error('github-repo-list', listing['error'], time.monotonic() - start)
+        metrics.record_fallback('repo_summary')
+        summary = EMPTY_REPO_SUMMARY
+    return summary, github_languages.format_stack(totals)
+
+def generate_profile_readme(username=GITHUB_USERNAME, profile=None):
+    """Generate the complete profile README (profile: prefetched stats/repos, if any)"""
+    now = datetime.now()
+    if profile is None:
+        with profiling.span('fetch:profile'):
+            profile = get_profile_data(username)
+    stats = profile['stats']
+    with profiling.span('fetch:streak'):
+        streak = get_contribution_streak()
+    with profiling.span('fetch:joke'):
+        joke = get_programming_joke()
+    with profiling.span('fetch:quote'):
+        quote = get_dev_quote()
+    with profiling.span('render:activity'):
+        activity = generate_activity_graph(username)
+    with profiling.span('fetch:repos'):
+        summary, tech_stack = get_repo_overview(username)
+    # GraphQL's recently updated repos are only needed when the listing failed
+    repos = summary['recently_pushed'] or profile['repos']
+    
+    with profiling.span('render:template'):
+        return profile_template.load_template(TEMPLATE_FILE).render({
+            'username': username,
+            'bio': stats['bio'] if stats else 'Building cool stuff!',
+            'location': stats['location'] if stats else 'None',
+            'streak': streak,
+            'activity': activity,
+            'tech_stack': tech_stack,
+            'repos': repos,
+            'summary': summary,
+            'quote': quote,
+            'joke': joke,
+            'updated': now.strftime('%B %d, %Y at %H:%M UTC'),
+            'commit_number': random.randint(1000, 9999),
+        })
+
+def init_batch_worker(language_workers):
+    """Give each worker process its share of the language-fetch threads and its own connections"""
+    github_languages.MAX_WORKERS = language_workers
+    # A forked child inherits the parent's pooled sockets; sharing them would interleave responses
+    http_client._session = None
+    github_client._client = None
+    http_cache._cache = None
+
+def render_profile(username, output_pattern, profile=None):
+    """Render one profile README to its own path (runs inside a worker process)
+
+    Returns the metrics recorded for this profile, since the worker's own registry is never written.
+    """
+    start = time.perf_counter()
+    path = output_pattern.format(username=username)
+    metrics.reset()
+    try:
+        content = generate_profile_readme(username, profile)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        output_writer.write_if_changed(path, content, VOLATILE_PATTERNS)
+        error = None
+    except Exception as e:
+        error = str(e)[:100]
+    return username, path, time.perf_counter() - start, error, metrics.snapshot()
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def load_usernames(users=None, users_file=None):
+    """Collect usernames from a comma-separated list and/or a file (one per line)"""
+    names = []
+    if users:
+        names.extend(name.strip() for name in users.split(','))
+    if users_file:
+        with open(users_file, 'r', encoding='utf-8') as f:
+            names.extend(line.split('#')[0].strip() for line in f)
+    # De-duplicate while keeping order
+    return list(dict.fromkeys(name for name in names if name))
+
+def render_batch(usernames, output_pattern, workers=4):
+    """Render many profiles on a process pool
+
+    Language fetches are split across the workers, so the whole batch keeps
+    github_languages.MAX_WORKERS requests in flight rather than that many per worker.
+    """
+    results = []
+    start = time.perf_counter()
+    profiles = prefetch_profiles(usernames)
+    if profiles:
+        print(f"Prefetched {len(profiles)} profiles via GraphQL")
+    language_workers = max(1, github_languages.MAX_WORKERS // workers)
+    # Drop the prefetch's keep-alive connections before forking so no worker inherits them
+    http_client.close()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                             initargs=(language_workers,)) as executor:
+        futures = [
+            executor.submit(render_profile, name, output_pattern, profiles.get(name))
+            for name in usernames
+        ]
+        for future in as_completed(futures):
+            username, path, elapsed, error, samples = future.result()
+            metrics.merge(samples)
+            if error:
+                print(f"  [FAIL] @{username}: {error}")
+            else:
+                print(f"  [OK] @{username} -> {path} ({elapsed:.2f}s)")
+            results.append((username, path, elapsed, error))
+    wall = time.perf_counter() - start
+    
+    timings = [elapsed for _, _, elapsed, error in results if not error]
+    failed = sum(1 for result in results if result[3])
+    print(f"\nRendered {len(timings)}/{len(results)} profiles in {wall:.2f}s with {workers} workers")
+    print(f"Throughput: {len(results) / wall if wall else 0:.2f} profiles/s")
+    print(f"Per profile: p50 {percentile(timings, 50):.2f}s | p95 {percentile(timings, 95):.2f}s")
+    return failed == 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate GitHub profile READMEs")
+    parser.add_argument('--users', help="Comma-separated usernames to render in batch mode")
+    parser.add_argument('--users-file', help="File with one username per line for batch mode")
+    parser.add_argument('--output', default=os.path.join('profiles', '{username}', 'README.md'),
+                        help="Output path pattern for batch mode (default: profiles/{username}/README.md)")
+    parser.add_argument('--workers', type=int, default=4, help="Worker processes for batch mode (default: 4)")
+    parser.add_argument('--profile', nargs='?', const='update_profile.trace.json', metavar='TRACE',
+                        help="Time each phase and write a Chrome trace (default: update_profile.trace.json)")
+    parser.add_argument('--metrics', default=None, metavar='PATH',
+                        help=f"Prometheus textfile to write after the run (default: {metrics.textfile_path('update_profile')})")
+    parser.add_argument('--exit-status', action='store_true',
+                        help=f"Exit with {output_writer.EXIT_UNCHANGED} when README.md had no meaningful changes")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.profile:
+        profiling.profiler.enable()
+    usernames = load_usernames(args.users, args.users_file)
+    if usernames:
+        print(f"Rendering {len(usernames)} profiles with {args.workers} workers...")
+        # Worker processes aren't traced; the batch shows up as a single span
+        with profiling.span('render:batch'):
+            ok = render_batch(usernames, args.output, max(1, args.workers))
+        if args.profile:
+            profiling.profiler.finish(args.profile)
+        metrics.write_textfile(args.metrics, script='update_profile')
+        sys.exit(0 if ok else 1)
+    
     try:
         print(f"Generating profile README for @{GITHUB_USERNAME}...")
         
         content = generate_profile_readme()
         
-        # Write with UTF-8 encoding
-        with open('README.md', 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Skip the write when only the timestamp/commit number differ
+        with profiling.span('write:readme'):
+            changed = output_writer.write_if_changed(OUTPUT_FILE, content, VOLATILE_PATTERNS)
         
-        print("Profile README generated successfully!")
+        if changed:
+            print("Profile README generated successfully!")
+        else:
+            print(f"No meaningful changes; {OUTPUT_FILE} left untouched")
         print("\n" + "="*60)
         print(content[:500] + "...")
         print("="*60)
     except Exception as e:
         print(f"Error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        metrics.write_textfile(args.metrics, script='update_profile')
+    
+    if args.profile:
+        profiling.profiler.finish(args.profile)
+    
+    if args.exit_status:
+        sys.exit(output_writer.exit_status(changed))
\ No newline at end of file
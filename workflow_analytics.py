@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Workflow Run Analytics
+Incrementally syncs Actions run history into SQLite and reports durations, queue delay and failures
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import argparse
+from datetime import datetime, timedelta, timezone
+import github_client
+import github_repos
+import workflow_runs
+
+ANALYTICS_DB_FILE = os.getenv('WORKFLOW_ANALYTICS_DB', os.path.join('.cache', 'workflow_analytics.db'))
+PER_PAGE = 100
+HISTORY_DAYS = 90  # how far back the first sync goes
+REPORT_WEEKS = 8
+WORKFLOWS = ('hourly-update.yml', 'update-profile.yml', 'daily-activity.yml')
+FAILED_CONCLUSIONS = ('failure', 'timed_out', 'startup_failure')
+# The commit steps end in `git push || (git pull --rebase && git push)`, so a failure there is a failed push retry
+PUSH_STEP_RE = re.compile(r'\b(commit|push)\b', re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    workflow TEXT NOT NULL,
+    name TEXT,
+    event TEXT,
+    status TEXT,
+    conclusion TEXT,
+    run_attempt INTEGER,
+    created_at REAL,
+    started_at REAL,
+    updated_at REAL,
+    failed_step TEXT,
+    jobs_checked INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_workflow ON runs (workflow, created_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+# watermark: newest run of the last pass that reached the stored history (or the end of the listing)
+# cursor / pass_newest / oldest_open: where an interrupted pass stopped, so the next sync carries on from there
+SYNC_STATE_KEYS = ('watermark', 'cursor', 'pass_newest', 'oldest_open')
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+def _workflow_file(run):
+    return os.path.basename(run.get('path') or '') or run.get('name') or 'unknown'
+
+class RunHistory:
+    """Completed and open runs per workflow, plus the failing step of each failed run"""
+
+    def __init__(self, path=None):
+        path = path or ANALYTICS_DB_FILE
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def sync_state(self):
+        """{key: value} for SYNC_STATE_KEYS, None where unset"""
+        state = dict.fromkeys(SYNC_STATE_KEYS)
+        state.update(self.db.execute('SELECT key, value FROM sync_state'))
+        return state
+
+    def save_sync_state(self, **values):
+        with self.db:
+            self.db.executemany(
+                'INSERT INTO sync_state (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value',
+                values.items()
+            )
+
+    def oldest_open(self):
+        """Oldest stored run that hadn't completed, which a pass must page back to"""
+        (oldest,) = self.db.execute("SELECT MIN(id) FROM runs WHERE status != 'completed'").fetchone()
+        return oldest
+
+    def store(self, run):
+        """Insert or update a run; a re-run resets the failing step so it is looked up again"""
+        row = (
+            run['id'], _workflow_file(run), run.get('name'), run.get('event'), run.get('status'),
+            run.get('conclusion'), run.get('run_attempt') or 1, workflow_runs.parse_time(run.get('created_at')),
+            workflow_runs.parse_time(run.get('run_started_at')), workflow_runs.parse_time(run.get('updated_at')),
+        )
+        with self.db:
+            self.db.execute("""
+                INSERT INTO runs (id, workflow, name, event, status, conclusion, run_attempt,
+                                  created_at, started_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    status = excluded.status, conclusion = excluded.conclusion,
+                    run_attempt = excluded.run_attempt, started_at = excluded.started_at,
+                    updated_at = excluded.updated_at,
+                    jobs_checked = CASE WHEN runs.run_attempt = excluded.run_attempt THEN runs.jobs_checked ELSE 0 END,
+                    failed_step = CASE WHEN runs.run_attempt = excluded.run_attempt THEN runs.failed_step ELSE NULL END
+            """, row)
+
+    def unchecked_failures(self):
+        placeholders = ', '.join('?' * len(FAILED_CONCLUSIONS))
+        return [run_id for (run_id,) in self.db.execute(
+            f'SELECT id FROM runs WHERE jobs_checked = 0 AND conclusion IN ({placeholders}) ORDER BY id',
+            FAILED_CONCLUSIONS
+        )]
+
+    def set_failed_step(self, run_id, step):
+        with self.db:
+            self.db.execute('UPDATE runs SET failed_step = ?, jobs_checked = 1 WHERE id = ?', (step, run_id))
+
+    def completed(self, since=None, workflow=None):
+        """Completed runs as dicts, oldest first"""
+        query = "SELECT * FROM runs WHERE status = 'completed'"
+        params = []
+        if since is not None:
+            query += ' AND created_at >= ?'
+            params.append(since)
+        if workflow:
+            query += ' AND workflow = ?'
+            params.append(workflow)
+        cursor = self.db.execute(query + ' ORDER BY created_at', params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def count(self):
+        (total,) = self.db.execute('SELECT COUNT(*) FROM runs').fetchone()
+        return total
+
+    def close(self):
+        self.db.close()
+
+def failed_step(repository, run_id, client=None):
+    """Name of the first failing step of a run's latest attempt, or None"""
+    client = client or github_client.get_client()
+    response = client.get(f'/repos/{repository}/actions/runs/{run_id}/jobs?filter=latest',
+                          priority=github_client.LOW, cached=False, timeout=10)
+    if response.status_code != 200:
+        raise github_repos.RepoFetchError(f"Jobs for run {run_id} returned {response.status_code}")
+    for job in response.json().get('jobs', []):
+        for step in job.get('steps') or []:
+            if step.get('conclusion') == 'failure':
+                return step.get('name')
+    return None
+
+def sync(history, repository=workflow_runs.REPOSITORY, history_days=HISTORY_DAYS, per_page=PER_PAGE,
+         check_jobs=True, client=None):
+    """Page newest-first until the stored history is reached; returns {'runs', 'pages', 'jobs'}
+
+    The watermark only advances once a pass completes. A pass that stops early
+    (rate limit, API error) leaves its next-page URL behind, and the following
+    sync continues from there before anything newer is treated as caught up.
+    """
+    client = client or github_client.get_client()
+    state = history.sync_state()
+    watermark = state['watermark']
+    if state['cursor']:
+        # New runs only push older ones onto later pages, so the saved page can't skip any
+        url, pass_newest, oldest_open = state['cursor'], state['pass_newest'], state['oldest_open']
+    else:
+        url = f'/repos/{repository}/actions/runs?per_page={per_page}'
+        if watermark is None:
+            start = (datetime.now(timezone.utc) - timedelta(days=history_days)).strftime('%Y-%m-%d')
+            url += f'&created=%3E%3D{start}'
+        pass_newest, oldest_open = None, history.oldest_open()
+    counts = {'runs': 0, 'pages': 0, 'jobs': 0}
+    while url:
+        response = client.get(url, priority=github_client.LOW, cached=False, timeout=10)
+        if response.status_code != 200:
+            raise github_repos.RepoFetchError(f"Workflow runs returned {response.status_code}")
+        counts['pages'] += 1
+        caught_up = False
+        for run in response.json().get('workflow_runs', []):
+            history.store(run)
+            counts['runs'] += 1
+            pass_newest = max(pass_newest or 0, run['id'])
+            # Runs that were still open last time are older than the watermark, so page back past them too
+            if watermark is not None and run['id'] <= watermark and (oldest_open is None or run['id'] < oldest_open):
+                caught_up = True
+        url = None if caught_up else github_repos.parse_link_header(response.headers.get('Link')).get('next')
+        if url:
+            history.save_sync_state(cursor=url, pass_newest=pass_newest, oldest_open=oldest_open)
+    history.save_sync_state(watermark=max(pass_newest or 0, watermark or 0) or None,
+                            cursor=None, pass_newest=None, oldest_open=None)
+
+    if check_jobs:
+        for run_id in history.unchecked_failures():
+            history.set_failed_step(run_id, failed_step(repository, run_id, client))
+            counts['jobs'] += 1
+    return counts
+
+def _week(timestamp):
+    """Monday of the ISO week, as YYYY-MM-DD"""
+    day = datetime.fromtimestamp(timestamp, timezone.utc).date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def summarize(runs):
+    """Duration / queue-delay percentiles and failure counts for a list of completed runs"""
+    durations = sorted(d for d in (run['updated_at'] - run['started_at'] for run in runs
+                                   if run['updated_at'] and run['started_at']) if d >= 0)
+    queued = sorted(q for q in (run['started_at'] - run['created_at'] for run in runs
+                                if run['started_at'] and run['created_at']) if q >= 0)
+    # Cancelled and skipped runs say nothing about reliability
+    decided = [run for run in runs if run['conclusion'] not in ('cancelled', 'skipped')]
+    failures = [run for run in decided if run['conclusion'] in FAILED_CONCLUSIONS]
+    return {
+        'runs': len(runs),
+        'p50': percentile(durations, 50),
+        'p95': percentile(durations, 95),
+        'max': durations[-1] if durations else None,
+        'queue_p50': percentile(queued, 50),
+        'queue_p95': percentile(queued, 95),
+        'failures': len(failures),
+        'failure_rate': len(failures) / len(decided) if decided else 0.0,
+        'push_failures': sum(1 for run in failures if run['failed_step'] and PUSH_STEP_RE.search(run['failed_step'])),
+    }
+
+def report(history, weeks=REPORT_WEEKS, workflows=None):
+    """{workflow: {'total': summary, 'weeks': {week start: summary}}} over the last `weeks` weeks"""
+    since = (datetime.now(timezone.utc) - timedelta(weeks=weeks)).timestamp()
+    grouped = {}
+    for run in history.completed(since):
+        grouped.setdefault(run['workflow'], []).append(run)
+    names = list(workflows) if workflows else sorted(grouped, key=lambda name: (name not in WORKFLOWS, name))
+    result = {}
+    for name in names:
+        runs = grouped.get(name, [])
+        by_week = {}
+        for run in runs:
+            by_week.setdefault(_week(run['created_at']), []).append(run)
+        result[name] = {
+            'total': summarize(runs),
+            'weeks': {week: summarize(week_runs) for week, week_runs in sorted(by_week.items())},
+        }
+    return result
+
+def _seconds(value):
+    if value is None:
+        return '-'
+    value = int(round(value))
+    return f"{value // 60}m{value % 60:02d}s" if value >= 60 else f"{value}s"
+
+def format_report(results, weeks=REPORT_WEEKS):
+    header = f"{'':<12}{'runs':>6}{'p50':>9}{'p95':>9}{'max':>9}{'queue p50':>11}{'queue p95':>11}{'fail':>8}{'push':>6}"
+    lines = []
+    for name, data in results.items():
+        lines.append(f"{name} (last {weeks} weeks)")
+        if not data['total']['runs']:
+            lines.append("  no completed runs\n")
+            continue
+        lines.append(header)
+        for label, s in list(data['weeks'].items()) + [('total', data['total'])]:
+            lines.append(
+                f"{label:<12}{s['runs']:>6}{_seconds(s['p50']):>9}{_seconds(s['p95']):>9}{_seconds(s['max']):>9}"
+                f"{_seconds(s['queue_p50']):>11}{_seconds(s['queue_p95']):>11}"
+                f"{s['failure_rate'] * 100:>7.1f}%{s['push_failures']:>6}"
+            )
+        lines.append('')
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync and report GitHub Actions run durations and failures")
+    parser.add_argument('command', nargs='?', choices=['sync', 'report'],
+                        help="Only sync or only report (default: both)")
+    parser.add_argument('--repo', default=workflow_runs.REPOSITORY,
+                        help=f"owner/repo (default: {workflow_runs.REPOSITORY})")
+    parser.add_argument('--weeks', type=int, default=REPORT_WEEKS, help=f"Weeks to report (default: {REPORT_WEEKS})")
+    parser.add_argument('--workflow', action='append', help="Workflow file to report (repeatable; default: all)")
+    parser.add_argument('--days', type=int, default=HISTORY_DAYS,
+                        help=f"History fetched by the first sync (default: {HISTORY_DAYS} days)")
+    parser.add_argument('--no-jobs', action='store_true', help="Skip the jobs API lookups for failed runs")
+    args = parser.parse_args()
+
+    history = RunHistory()
+    try:
+        if args.command in (None, 'sync'):
+            state = history.sync_state()
+            if state['cursor']:
+                detail = ", continuing the interrupted pass"
+            elif state['watermark']:
+                detail = f", resuming after run {state['watermark']}"
+            else:
+                detail = f", last {args.days} days"
+            print(f"Syncing {args.repo}{detail}", file=sys.stderr)
+            try:
+                counts = sync(history, args.repo, args.days, check_jobs=not args.no_jobs)
+                print(f"{counts['runs']} runs from {counts['pages']} pages, {counts['jobs']} failed runs inspected; "
+                      f"{history.count()} stored", file=sys.stderr)
+            except (github_client.RateLimitDeferred, github_repos.RepoFetchError) as e:
+                print(f"[WARN] Sync stopped: {e}", file=sys.stderr)
+        if args.command in (None, 'report'):
+            print(format_report(report(history, args.weeks, args.workflow), args.weeks), end='')
+    finally:
+        history.close()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Workflow Run Poller
+Conditional, adaptive polling of GitHub Actions runs with a local index of the runs already seen
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+import github_client
+
+RUNS_INDEX_FILE = os.getenv('WORKFLOW_RUNS_INDEX', os.path.join('.cache', 'workflow_runs.json'))
+REPOSITORY = os.getenv('GITHUB_REPOSITORY', 'Drakaniia/Drakaniia')
+PER_PAGE = 20
+INDEX_LIMIT = 200  # most recent run IDs remembered
+ACTIVE_INTERVAL = 15  # seconds between polls while a run is queued or in progress
+IDLE_INTERVAL = 60  # first idle delay, doubled after every poll that finds nothing new
+MAX_INTERVAL = 30 * 60
+
+ACTIVE_STATUSES = ('queued', 'in_progress', 'waiting', 'requested', 'pending')
+RUN_FIELDS = ('id', 'name', 'path', 'event', 'status', 'conclusion', 'run_attempt',
+              'created_at', 'run_started_at', 'updated_at', 'html_url')
+
+class RunPollError(Exception):
+    pass
+
+def parse_time(value):
+    """Epoch seconds from a GitHub ISO-8601 timestamp, or None"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc).timestamp()
+
+def queue_delay(run):
+    """Seconds between the run being created and starting"""
+    created, started = parse_time(run.get('created_at')), parse_time(run.get('run_started_at'))
+    return None if created is None or started is None else max(0.0, started - created)
+
+def run_duration(run):
+    """Seconds from start to the last update; only meaningful once the run has completed"""
+    started, updated = parse_time(run.get('run_started_at')), parse_time(run.get('updated_at'))
+    return None if started is None or updated is None else max(0.0, updated - started)
+
+def run_summary(run):
+    """Keep the fields the monitor compares and reports"""
+    return {field: run.get(field) for field in RUN_FIELDS}
+
+def load_index(path=None):
+    """{run id (str): run summary} from the last poll"""
+    path = path or RUNS_INDEX_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_index(index, path=None):
+    path = path or RUNS_INDEX_FILE
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+class RunPoller:
+    """Polls the runs listing with If-None-Match and reports only new or changed runs
+
+    `interval` is the delay the caller should wait before the next poll: short
+    while a run is queued or in progress, doubling up to max_interval when idle.
+    """
+
+    def __init__(self, repository=REPOSITORY, index_path=None, client=None, per_page=PER_PAGE,
+                 active_interval=ACTIVE_INTERVAL, idle_interval=IDLE_INTERVAL, max_interval=MAX_INTERVAL):
+        self.repository = repository
+        self.index_path = index_path
+        self.client = client or github_client.get_client()
+        self.per_page = per_page
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.max_interval = max_interval
+        self.index = load_index(index_path)
+        self.interval = 0
+        self.active = False
+        self.idle_polls = 0
+        self.stats = {'polls': 0, 'not_modified': 0, 'changes': 0}
+
+    @property
+    def url(self):
+        return f'/repos/{self.repository}/actions/runs?per_page={self.per_page}'
+
+    def poll(self):
+        """Return [(previous summary or None, current summary)] for runs that are new or changed"""
+        # max_age=0: always ask, but with the stored ETag, so an unchanged listing comes back as a 304
+        response = self.client.get(self.url, priority=github_client.LOW, max_age=0, timeout=10)
+        if response.status_code != 200:
+            raise RunPollError(f"Workflow runs returned {response.status_code}")
+        runs = response.json().get('workflow_runs', [])
+        self.stats['polls'] += 1
+        if getattr(response, 'revalidated', False) and all(str(run['id']) in self.index for run in runs):
+            self.stats['not_modified'] += 1
+            changes = []
+        else:
+            changes = self._merge(runs)
+        self.active = any(run.get('status') in ACTIVE_STATUSES for run in runs)
+        self._schedule(changes)
+        return changes
+
+    def _merge(self, runs):
+        changes = []
+        for run in runs:
+            key = str(run['id'])
+            summary = run_summary(run)
+            previous = self.index.get(key)
+            if previous != summary:
+                self.index[key] = summary
+                changes.append((previous, summary))
+        if changes:
+            if len(self.index) > INDEX_LIMIT:
+                keep = sorted(self.index, key=int)[-INDEX_LIMIT:]
+                self.index = {key: self.index[key] for key in keep}
+            save_index(self.index, self.index_path)
+            self.stats['changes'] += len(changes)
+        # Oldest first, so transitions are reported in the order they happened
+        return sorted(changes, key=lambda change: change[1]['id'])
+
+    def _schedule(self, changes):
+        if self.active:
+            self.idle_polls = 0
+            self.interval = self.active_interval
+        elif changes:
+            self.idle_polls = 0
+            self.interval = self.idle_interval
+        else:
+            # First idle poll waits idle_interval, then it doubles
+            self.interval = min(self.max_interval, self.idle_interval * 2 ** self.idle_polls)
+            self.idle_polls += 1
+
+    def back_off(self, until=None):
+        """After a failed poll: wait until `until` (epoch seconds) if given, else as for an idle poll"""
+        self._schedule([])
+        if until:
+            self.interval = max(self.interval, until - time.time())
+        return self.interval
+
+def describe_run(run):
+    """One line for a run's current state"""
+    name = run.get('name') or run.get('path') or 'workflow'
+    label = f"{name} #{run['id']}"
+    if (run.get('run_attempt') or 1) > 1:
+        label += f" (attempt {run['run_attempt']})"
+    if run.get('status') != 'completed':
+        return f"{label}: {run.get('status')}"
+    duration = run_duration(run)
+    took = f" in {int(duration // 60)}m {int(duration % 60)}s" if duration is not None else ""
+    return f"{label}: {run.get('conclusion')}{took}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll GitHub Actions runs and print new or changed ones")
+    parser.add_argument('repository', nargs='?', default=REPOSITORY, help=f"owner/repo (default: {REPOSITORY})")
+    parser.add_argument('--watch', action='store_true', help="Keep polling at the adaptive interval")
+    args = parser.parse_args()
+
+    poller = RunPoller(args.repository)
+    try:
+        while True:
+            try:
+                for _, run in poller.poll():
+                    print(describe_run(run))
+            except github_client.RateLimitDeferred as e:
+                print(f"[WARN] {e}", file=sys.stderr)
+                poller.back_off(e.reset)
+            except Exception as e:
+                print(f"[WARN] {str(e)[:100]}", file=sys.stderr)
+                poller.back_off()
+            if not args.watch:
+                break
+            print(f"next poll in {int(poller.interval)}s ({'active' if poller.active else 'idle'})", file=sys.stderr)
+            time.sleep(poller.interval)
+    except KeyboardInterrupt:
+        pass